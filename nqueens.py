@@ -1,9 +1,46 @@
+import os
+import io
 import sys
+import json
 import random
+import argparse
+import contextlib
 import math
 import timeit
+import bisect
+import heapq
+import itertools
+from array import array
+from collections import namedtuple, deque, OrderedDict
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is only needed for the vectorized modes
+	np = None
 
 MAXQ = 100
+MAXQ_MIN_CONFLICTS = 10 ** 7  # min-conflicts scales far beyond the other algorithms
+PRINT_BOARD_COLUMNS = 20  # conflicted columns listed in the summary of a board too large to print
+
+# Outcome of a solver run: the final board, its number of conflicts, the number of iterations (generations
+# for the genetic algorithm) and the number of board or move evaluations it took
+SearchResult = namedtuple('SearchResult', ['board', 'conflicts', 'iterations', 'evaluations'])
+
+# Progress of a running search as reported by SearchMonitor, the energy is the number of conflicts
+ProgressEvent = namedtuple('ProgressEvent', ['iterations', 'evaluations', 'accepted', 'rejected', 'energy',
+											 'best_energy', 'elapsed', 'rate'])
+PROGRESS_INTERVAL = 100  # iterations between the progress lines main() prints
+MOVE_BATCH = 1024  # random moves drawn at once by anneal()
+
+ADAPTIVE_KMAX_PER_QUEEN = 4000  # iteration budget of adaptive_anneal() per queen
+ADAPTIVE_CYCLE_PER_QUEEN = 50  # iterations per queen to cool down to ADAPTIVE_FINAL_TEMPERATURE
+ADAPTIVE_FINAL_TEMPERATURE = 0.01  # fraction of the initial temperature reached at the end of a cycle
+ADAPTIVE_PATIENCE = 2  # iterations per queen squared without improvement before a reheat
+ADAPTIVE_REHEAT = 0.1  # fraction of the initial temperature a reheat goes back to
+
+# Schedule picked by adaptive_anneal(): the initial temperature, the factor the temperature is multiplied
+# with every iteration, the iteration budget and the number of reheats that were needed
+AnnealingSchedule = namedtuple('AnnealingSchedule', ['initial_temperature', 'cooling_rate', 'kmax', 'reheats'])
 
 
 def in_conflict(column, row, other_column, other_row):
@@ -68,22 +105,45 @@ def evaluate_state(board):
 	return (len(board)-1)*len(board)/2 - count_conflicts(board)
 
 
-def print_board(board):
+def print_board(board, file=None, max_size=None):
 	"""
-	Prints the board in a human readable format in the terminal.
+	Prints the board in a human readable format in the terminal. Queens in conflict are found from the row
+	and diagonal counts of a BoardState, so each cell costs O(1), and each line is written as a single join.
+	Boards larger than max_size are summarised by their number of conflicts and conflicted columns instead.
 	:param board: The board with all the queens.
+	:param file: Text stream to write to, defaults to sys.stdout.
+	:param max_size: Largest board printed as a grid, defaults to MAXQ.
 	"""
-	print("\n")
+	if file is None:
+		file = sys.stdout
+	if max_size is None:
+		max_size = MAXQ
+	nqueens = len(board)
+	state = BoardState(board)
+	file.write("\n\n")
+
+	if nqueens > max_size:
+		columns = state.conflicted_columns()
+		shown = ', '.join(map(str, columns[:PRINT_BOARD_COLUMNS]))
+		if len(columns) > PRINT_BOARD_COLUMNS:
+			shown += ', ...'
+		file.write('Board of ' + str(nqueens) + ' queens, ' + str(state.conflicts) + ' conflicts, '
+				   + str(len(columns)) + ' queens in conflict' + (': columns ' + shown if columns else '') + '\n')
+		return
+
+	queens = [[] for _ in range(nqueens)]
+	for column, row in enumerate(board):
+		queens[row].append(column)
+	empty = '.' * nqueens
 
-	for row in range(len(board)):
-		line = ''
-		for column in range(len(board)):
-			if board[column] == row:
-				line += 'Q' if in_conflict_with_another_queen(
-					row, column, board) else 'q'
-			else:
-				line += '.'
-		print(line)
+	for row in range(nqueens):
+		if not queens[row]:
+			file.write(empty + '\n')
+			continue
+		line = list(empty)
+		for column in queens[row]:
+			line[column] = 'Q' if state.queen_conflicts(column) > 0 else 'q'
+		file.write(''.join(line) + '\n')
 
 
 def init_board(nqueens):
@@ -104,7 +164,356 @@ def init_board(nqueens):
 ------------------ Do not change the code above! ------------------
 """
 
-def heuristic_state_space(board):
+
+def board_typecode(nqueens):
+	"""
+	:param nqueens: Number of queens on the board.
+	:return: The smallest unsigned array typecode that can hold every row of the board.
+	"""
+	return 'H' if nqueens <= 1 << 16 else 'L'
+
+
+class Board:
+	"""
+	Compact board backed by an unsigned array instead of a list of ints. It behaves like the list
+	representation (indexing, slicing, len, iteration, copy and +), so it can be passed to every function
+	that takes a board. On top of that, move() changes a queen in place and remembers the old row so
+	undo() can put it back, which lets a search try a successor without copying the board.
+
+	Board is an accepted input type for callers that want the compact store, e.g. to keep many boards in
+	memory; the solvers and benchmark loops do not create one themselves. Reading an element from an array
+	boxes a new int, so every solver runs 10-120% slower on a Board than on a list, while the solvers
+	already avoid the per-successor copies through BoardState. Like a list, a Board is mutable and
+	unhashable; use zobrist_hash() or a tuple of it as a dict key.
+	"""
+
+	__slots__ = ('rows', 'history')
+
+	def __init__(self, rows=(), typecode=None):
+		"""
+		:param rows: iterable with the row of the queen on every column
+		:param typecode: array typecode of the store, chosen from the board size when not given
+		"""
+		if typecode is None:
+			rows = list(rows)
+			typecode = board_typecode(len(rows))
+		self.rows = array(typecode, rows)
+		self.history = []
+
+	@classmethod
+	def wrap(cls, rows):
+		"""
+		:param rows: array to use as the store without copying it
+		:return: Board sharing the given array
+		"""
+		board = cls.__new__(cls)
+		board.rows = rows
+		board.history = []
+		return board
+
+	def __len__(self):
+		return len(self.rows)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return Board.wrap(self.rows[index])
+		return self.rows[index]
+
+	def __setitem__(self, index, row):
+		self.rows[index] = row
+
+	def __iter__(self):
+		return iter(self.rows)
+
+	def __add__(self, other):
+		rows = self.rows[:]
+		rows.extend(other.rows if isinstance(other, Board) else other)
+		return Board.wrap(rows)
+
+	def __eq__(self, other):
+		if isinstance(other, Board):
+			return self.rows == other.rows
+		if not isinstance(other, (list, tuple, array)):
+			return NotImplemented
+		return list(self.rows) == list(other)
+
+	def __lt__(self, other):
+		if isinstance(other, Board):
+			return self.rows < other.rows
+		if not isinstance(other, (list, tuple, array)):
+			return NotImplemented
+		return list(self.rows) < list(other)
+
+	def __repr__(self):
+		return 'Board(' + str(list(self.rows)) + ')'
+
+	def __array__(self, dtype=None, copy=None):
+		return np.array(self.rows, dtype=dtype)
+
+	def tolist(self):
+		return self.rows.tolist()
+
+	def copy(self):
+		"""
+		:return: Snapshot of the board. Copying the array store is a single memory copy.
+		"""
+		return Board.wrap(self.rows[:])
+
+	snapshot = copy
+
+	def restore(self, snapshot):
+		"""
+		Resets the board to a snapshot taken with snapshot() and forgets the move history.
+		:param snapshot: Board of the same size.
+		"""
+		self.rows[:] = snapshot.rows
+		self.history.clear()
+
+	def move(self, column, row):
+		"""
+		Moves the queen in the given column to the given row, remembering the old row for undo().
+		:param column: Column of the queen to move.
+		:param row: Row to move the queen to.
+		"""
+		self.history.append((column, self.rows[column]))
+		self.rows[column] = row
+
+	def undo(self):
+		"""
+		Reverts the last move().
+		"""
+		column, row = self.history.pop()
+		self.rows[column] = row
+
+
+ZOBRIST_SEED = 2023
+ZOBRIST_KEYS = {}  # board size -> flat list of keys, filled by zobrist_keys()
+
+
+def zobrist_keys(nqueens):
+	"""
+	Random 64-bit Zobrist key for every (column, row) pair, in a flat list indexed by column * n + row.
+	The keys come from their own generator with a fixed seed, so they are the same in every process and
+	do not disturb the random stream of the solvers. They are cached per board size; the table has n^2
+	entries, which is fine up to a few thousand queens.
+	:param nqueens: Number of queens on the board.
+	:return: list of n * n keys
+	"""
+	keys = ZOBRIST_KEYS.get(nqueens)
+	if keys is None:
+		generator = random.Random(ZOBRIST_SEED * 1000003 + nqueens)
+		keys = [generator.getrandbits(64) for square in range(nqueens * nqueens)]
+		ZOBRIST_KEYS[nqueens] = keys
+	return keys
+
+
+def zobrist_hash(board):
+	"""
+	Zobrist hash of a board: the XOR of the keys of all queens. Two boards of the same size with the same
+	queens have the same hash, and moving one queen changes it by XOR-ing out the old key and XOR-ing in
+	the new one, see BoardState.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:return: 64-bit integer usable as a dict key
+	"""
+	nqueens = len(board)
+	keys = zobrist_keys(nqueens)
+	board_hash = 0
+	for column, row in enumerate(board):
+		board_hash ^= keys[column * nqueens + row]
+	return board_hash
+
+
+class BoardState:
+	"""
+	Incremental conflict tracker for a board. Keeps the number of queens on every row, diagonal and
+	anti-diagonal, so the number of conflicting pairs is the sum of (k choose 2) over those lines. Moving
+	a single queen only touches six counters, which makes the conflict delta of a move O(1) instead of
+	the O(n^2) rescan done by count_conflicts().
+
+	The board is shared, not copied: move() updates it in place.
+
+	With hashing enabled the state also keeps the Zobrist hash of the board in self.hash, updated with two
+	XORs per move, so the current board and any successor can be used as a dict key for visited sets,
+	caches or tabu lists without rehashing the whole board.
+
+	Samplers such as annealing can use propose(), then commit() or revert(): a proposal only stores the
+	move and returns its delta, so a rejected move costs nothing and never touches the board.
+	"""
+
+	def __init__(self, board, hashing=False):
+		"""
+		:param board: list/array representation of columns and the row of the queen on that column
+		:param hashing: maintain the Zobrist hash of the board in self.hash
+		"""
+		nqueens = len(board)
+		self.board = board
+		self.nqueens = nqueens
+		self.rows = [0] * nqueens
+		self.diagonals = [0] * (2 * nqueens - 1)  # indexed by column - row + nqueens - 1
+		self.anti_diagonals = [0] * (2 * nqueens - 1)  # indexed by column + row
+
+		rows, diagonals, anti_diagonals = self.rows, self.diagonals, self.anti_diagonals
+		offset = nqueens - 1
+		for column, row in enumerate(board):
+			rows[row] += 1
+			diagonals[column - row + offset] += 1
+			anti_diagonals[column + row] += 1
+
+		self.conflicts = sum(k * (k - 1) // 2 for counts in (rows, diagonals, anti_diagonals)
+							 for k in counts if k > 1)
+		self.keys = zobrist_keys(nqueens) if hashing else None
+		self.hash = zobrist_hash(board) if hashing else None
+		self.proposed_column = -1
+		self.proposed_row = -1
+
+	def hash_after(self, column, row):
+		"""
+		:param column: Column of the queen to move.
+		:param row: Row to move the queen to.
+		:return: Zobrist hash the board would have after the move, requires hashing.
+		"""
+		base = column * self.nqueens
+		return self.hash ^ self.keys[base + self.board[column]] ^ self.keys[base + row]
+
+	def queen_conflicts(self, column):
+		"""
+		:param column: Column of the queen to be checked.
+		:return: The number of queens attacking the queen in the given column.
+		"""
+		row = self.board[column]
+		return (self.rows[row] + self.diagonals[column - row + self.nqueens - 1]
+				+ self.anti_diagonals[column + row] - 3)
+
+	def conflicted_columns(self):
+		"""
+		:return: List of the columns whose queen is in conflict with another queen.
+		"""
+		return [column for column in range(self.nqueens) if self.queen_conflicts(column) > 0]
+
+	def delta(self, column, row):
+		"""
+		Change in the number of conflicts if the queen in the given column were moved to the given row.
+		The old and new squares never share a row or diagonal, so the counters can be read as they are.
+		:param column: Column of the queen to move.
+		:param row: Row to move the queen to.
+		:return: New number of conflicts minus the current number of conflicts.
+		"""
+		old_row = self.board[column]
+		if row == old_row:
+			return 0
+		offset = self.nqueens - 1
+		removed = (self.rows[old_row] + self.diagonals[column - old_row + offset]
+				   + self.anti_diagonals[column + old_row] - 3)
+		added = self.rows[row] + self.diagonals[column - row + offset] + self.anti_diagonals[column + row]
+		return added - removed
+
+	def propose(self, column, row):
+		"""
+		Proposes moving the queen in the given column to the given row, to be followed by commit() or revert().
+		:param column: Column of the queen to move.
+		:param row: Row to move the queen to.
+		:return: Change in the number of conflicts the move would make.
+		"""
+		self.proposed_column = column
+		self.proposed_row = row
+		return self.delta(column, row)
+
+	def commit(self):
+		"""
+		Applies the move of the last propose().
+		:return: The change in the number of conflicts.
+		"""
+		return self.move(self.proposed_column, self.proposed_row)
+
+	def revert(self):
+		"""
+		Drops the move of the last propose(), the board and the counters were never changed.
+		"""
+		self.proposed_column = -1
+		self.proposed_row = -1
+
+	def move(self, column, row):
+		"""
+		Moves the queen in the given column to the given row, updating the board and the counters.
+		:param column: Column of the queen to move.
+		:param row: Row to move the queen to.
+		:return: The change in the number of conflicts.
+		"""
+		delta = self.delta(column, row)
+		old_row = self.board[column]
+		offset = self.nqueens - 1
+		self.rows[old_row] -= 1
+		self.diagonals[column - old_row + offset] -= 1
+		self.anti_diagonals[column + old_row] -= 1
+		self.rows[row] += 1
+		self.diagonals[column - row + offset] += 1
+		self.anti_diagonals[column + row] += 1
+		if self.keys is not None:
+			self.hash = self.hash_after(column, row)
+		self.board[column] = row
+		self.conflicts += delta
+		return delta
+
+
+def successor_conflicts(board):
+	"""
+	Builds the n x n matrix of the number of conflicts after moving the queen in column c to row r, for
+	every c and r at once, from the row and diagonal counts of the board. Entry [c, board[c]] holds the
+	conflicts of the board itself. Requires NumPy.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:return: NumPy array where [column, row] is the number of conflicts of that successor
+	"""
+	nqueens = len(board)
+	queen_rows = np.asarray(board, dtype=np.intp)
+	columns = np.arange(nqueens)
+	rows = np.bincount(queen_rows, minlength=nqueens)
+	diagonals = np.bincount(columns - queen_rows + nqueens - 1, minlength=2 * nqueens - 1)
+	anti_diagonals = np.bincount(columns + queen_rows, minlength=2 * nqueens - 1)
+	conflicts = sum(int((counts * (counts - 1)).sum()) // 2 for counts in (rows, diagonals, anti_diagonals))
+
+	# Conflicts of each queen on its current square, lost when it moves away
+	removed = (rows[queen_rows] + diagonals[columns - queen_rows + nqueens - 1]
+			   + anti_diagonals[columns + queen_rows] - 3)
+	target_columns = columns[:, None]
+	target_rows = columns[None, :]
+	added = (rows[target_rows] + diagonals[target_columns - target_rows + nqueens - 1]
+			 + anti_diagonals[target_columns + target_rows])
+
+	successors = conflicts - removed[:, None] + added
+	successors[columns, queen_rows] = conflicts
+	return successors
+
+
+def vectorized_best_successor(board):
+	"""
+	Picks the best successor from the successor_conflicts() matrix, choosing at random among ties.
+	Candidates are listed in the same column-major order as heuristic_state_space(), so for a given
+	seed the same successor is chosen.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:return: index column * n + row of the chosen successor, or None if every successor is worse than the board
+	"""
+	if np is None:
+		raise ImportError('The vectorized mode requires NumPy')
+	nqueens = len(board)
+	successors = successor_conflicts(board)
+	current = np.zeros((nqueens, nqueens), dtype=bool)
+	current[np.arange(nqueens), np.asarray(board, dtype=np.intp)] = True
+
+	# Successors only count as best if they are at least as good as the current board
+	best = int(successors[~current].min(initial=successors[0, board[0]]))
+	set_of_best_successors = np.flatnonzero((successors == best) & ~current).tolist()
+	if not set_of_best_successors:
+		return None
+	return random.choice(set_of_best_successors)
+
+
+def heuristic_state_space(board, vectorized=False):
+	if vectorized:
+		best_successor = vectorized_best_successor(board)
+		if best_successor is not None:
+			board[best_successor // len(board)] = best_successor % len(board)
+		return board
+
 	heuristic_state_space = state_space(board)
 	best_successor_evaluation = evaluate_state(board)
 	set_of_best_successors = []
@@ -113,9 +522,10 @@ def heuristic_state_space(board):
 		for possible_successor in range(len(board)):
 			# if current queen is not at that state
 			if possible_successor != row:
-				possible_successor_board = board.copy()
-				possible_successor_board[column] = possible_successor
-				successor_evaluation = evaluate_state(possible_successor_board)
+				# Evaluate the successor in place instead of copying the board
+				board[column] = possible_successor
+				successor_evaluation = evaluate_state(board)
+				board[column] = row
 				heuristic_state_space[i] = successor_evaluation
 				if successor_evaluation == best_successor_evaluation:
 					set_of_best_successors.append(i)
@@ -124,6 +534,8 @@ def heuristic_state_space(board):
 					set_of_best_successors.clear()
 					set_of_best_successors.append(i)
 			i = i + 1
+	if not set_of_best_successors:
+		return board  # strict local maximum, every successor is worse
 	best_successor = random.choice(set_of_best_successors)
 
 	move_queen_in_collumn = math.ceil((best_successor + 1) / len(board))
@@ -145,102 +557,222 @@ def state_space(board):
 	return state_space
 
 
-def heuristic_state_space_improved(board):
-    heuristic_state_space = state_space(board)
-    best_successor_evaluation = evaluate_state(board)
-    set_of_best_successors = []
-    i = 0
-    for column, row in enumerate(board):
-        for possible_successor in range(len(board)):
-            # if current queen is not at that state
-            if possible_successor != row:
-                possible_successor_board = board.copy()
-                possible_successor_board[column] = possible_successor
-                successor_evaluation = evaluate_state(possible_successor_board)
-                heuristic_state_space[i] = successor_evaluation
-                if successor_evaluation == best_successor_evaluation:
-                    set_of_best_successors.append(i)
-                if successor_evaluation > best_successor_evaluation:
-                    best_successor_evaluation = successor_evaluation
-                    set_of_best_successors.clear()
-                    set_of_best_successors.append(i)
-            i = i + 1
-    best_successor = random.choice(set_of_best_successors)
-
-    move_queen_in_collumn = math.ceil((best_successor + 1) / len(board))
-    move_queen_to_position = best_successor - \
-        ((move_queen_in_collumn - 1) * len(board))
-    board[move_queen_in_collumn - 1] = move_queen_to_position
-    return board
-
-
-def random_search(board):
+def heuristic_state_space_improved(board, state=None, vectorized=False):
+	"""
+	Moves the queen that gives the best successor, choosing at random among equally good successors.
+	The board is left unchanged at a strict local maximum. Successors are scored with the conflict deltas
+	of a BoardState, so no successor board is copied or rescanned.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:param state: BoardState tracking the board, created when not given
+	:param vectorized: score all successors at once with NumPy, see vectorized_best_successor()
+	:return: the board with the best successor move applied
+	"""
+	if state is None:
+		state = BoardState(board)
+	if vectorized:
+		best_successor = vectorized_best_successor(board)
+		if best_successor is not None:
+			state.move(best_successor // len(board), best_successor % len(board))
+		return board
+
+	heuristic_state_space = state_space(board)
+	optimum = (len(board) - 1) * len(board) / 2
+	current_evaluation = optimum - state.conflicts
+	best_successor_evaluation = current_evaluation
+	set_of_best_successors = []
+	i = 0
+	for column, row in enumerate(board):
+		for possible_successor in range(len(board)):
+			# if current queen is not at that state
+			if possible_successor != row:
+				successor_evaluation = current_evaluation - state.delta(column, possible_successor)
+				heuristic_state_space[i] = successor_evaluation
+				if successor_evaluation == best_successor_evaluation:
+					set_of_best_successors.append(i)
+				if successor_evaluation > best_successor_evaluation:
+					best_successor_evaluation = successor_evaluation
+					set_of_best_successors.clear()
+					set_of_best_successors.append(i)
+			i = i + 1
+	if not set_of_best_successors:
+		return board  # strict local maximum, every successor is worse
+	best_successor = random.choice(set_of_best_successors)
+
+	move_queen_in_collumn = math.ceil((best_successor + 1) / len(board))
+	move_queen_to_position = best_successor - \
+		((move_queen_in_collumn - 1) * len(board))
+	state.move(move_queen_in_collumn - 1, move_queen_to_position)
+	return board
+
+
+class SearchMonitor:
+	"""
+	Progress instrumentation for the local searches. A solver given a monitor calls step() once per
+	iteration, which only updates a few counters; every interval iterations, and once more from finish(),
+	a ProgressEvent is passed to the callback or, without one, printed as a line to file. Solvers skip all
+	of this when no monitor is given, so the searches cost nothing extra by default.
+	"""
+
+	def __init__(self, interval=PROGRESS_INTERVAL, callback=None, file=None):
+		"""
+		:param interval: iterations between progress events, 0 or None for only the final one
+		:param callback: called with every ProgressEvent instead of printing it
+		:param file: text stream the progress lines are written to, defaults to sys.stdout
+		"""
+		self.interval = interval or 0
+		self.callback = callback
+		self.file = file
+		self.iterations = 0
+		self.evaluations = 0
+		self.accepted = 0
+		self.rejected = 0
+		self.energy = None
+		self.best_energy = math.inf
+		self.start_time = timeit.default_timer()
+		self.emitted = -1  # iteration of the last event, so finish() does not repeat it
+
+	def step(self, energy, evaluations=1, accepted=True):
+		"""
+		Records one iteration of a search.
+		:param energy: number of conflicts after the iteration
+		:param evaluations: number of boards or moves evaluated in the iteration
+		:param accepted: whether the iteration changed the board
+		"""
+		self.iterations += 1
+		self.evaluations += evaluations
+		if accepted:
+			self.accepted += 1
+		else:
+			self.rejected += 1
+		self.energy = energy
+		if energy < self.best_energy:
+			self.best_energy = energy
+		if self.interval and self.iterations % self.interval == 0:
+			self.emit()
+
+	def event(self):
+		"""
+		:return: ProgressEvent with the counters so far
+		"""
+		elapsed = timeit.default_timer() - self.start_time
+		rate = self.evaluations / elapsed if elapsed > 0 else math.inf
+		return ProgressEvent(self.iterations, self.evaluations, self.accepted, self.rejected, self.energy,
+							 self.best_energy, elapsed, rate)
+
+	def emit(self):
+		event = self.event()
+		self.emitted = self.iterations
+		if self.callback is not None:
+			self.callback(event)
+			return
+		file = self.file if self.file is not None else sys.stdout
+		file.write('iteration ' + str(event.iterations) + ': conflicts = ' + str(event.energy) + ' (best '
+				   + str(event.best_energy) + '), ' + str(event.evaluations) + ' evaluations, '
+				   + str(event.accepted) + ' accepted, ' + str(event.rejected) + ' rejected, '
+				   + str(round(event.rate)) + ' evaluations per second\n')
+
+	def finish(self):
+		"""
+		Emits the final event, unless the last iteration was already reported.
+		:return: the final ProgressEvent
+		"""
+		if self.emitted != self.iterations and self.energy is not None:
+			self.emit()
+		return self.event()
+
+
+def random_search(board, monitor=None):
 	"""
 	This function is an example and not an efficient solution to the nqueens problem. What it essentially does is flip
 	over the board and put all the queens on a random position.
 	:param board: list/array representation of columns and the row of the queen on that column
+	:param monitor: optional SearchMonitor that is told about every iteration
+	:return: SearchResult of the run
 	"""
 
 	i = 0
-	optimum = (len(board) - 1) * len(board) / 2
+	state = BoardState(board)
+	evaluations = 1
 
-	while evaluate_state(board) != optimum:
+	while state.conflicts != 0:
 		i += 1
-		# print('iteration ' + str(i) + ': evaluation = ' +
-		# 	  str(evaluate_state(board)))
 		if i == 1000:  # Give up after 1000 tries.
 			break
 
 		# For each column, place the queen in a random row
 		for column, row in enumerate(board):
 			board[column] = random.randint(0, len(board)-1)
-
-	if evaluate_state(board) == optimum:
+		state = BoardState(board)
+		evaluations += 1
+		if monitor is not None:
+			monitor.step(state.conflicts)
+
+	if monitor is not None:
+		monitor.finish()
+	if state.conflicts == 0:
 		print('Solved puzzle!')
 
 	print('Final state is:')
 	print_board(board)
+	return SearchResult(board, state.conflicts, i, evaluations)
 
 
-def hill_climbing_pseudo_code(board):
+def hill_climbing_pseudo_code(board, vectorized=False, monitor=None):
 	i = 0
 	optimum = (len(board) - 1) * len(board) / 2
+	evaluations = 0
 
 	while evaluate_state(board) != optimum:
 		i += 1
-		print('iteration ' + str(i) + ': evaluation = ' + str(evaluate_state(board)))
 		if i == 1000:  # Give up after 1000 tries.
 			break
 		board_evaluation = evaluate_state(board)
-		board = heuristic_state_space(board)
+		board = heuristic_state_space(board, vectorized)
+		evaluations += len(board) * (len(board) - 1)
 		successor_board_evaluation = evaluate_state(board)
+		if monitor is not None:
+			monitor.step(int(optimum - successor_board_evaluation), len(board) * (len(board) - 1),
+						 successor_board_evaluation != board_evaluation)
 		if (board_evaluation == successor_board_evaluation):
 			break
 
-	if evaluate_state(board) == optimum:
+	if monitor is not None:
+		monitor.finish()
+	conflicts = count_conflicts(board)
+	if conflicts == 0:
 		print('Solved puzzle!')
 
 	print('Final state is:')
 	print_board(board)
+	return SearchResult(board, conflicts, i, evaluations)
 
 
-def hill_climbing_improved(board):
+def hill_climbing_improved(board, vectorized=False, monitor=None):
 	i = 0
-	optimum = (len(board) - 1) * len(board) / 2
+	state = BoardState(board)
+	evaluations = 0
 
-	while evaluate_state(board) != optimum:
+	while state.conflicts != 0:
 		i += 1
-		print('iteration ' + str(i) + ': evaluation = ' +
-			  str(evaluate_state(board)))
 		if i == 1000:  # Give up after 1000 tries.
 			break
-		board = heuristic_state_space_improved(board)
-
-	if evaluate_state(board) == optimum:
+		previous_board = board.copy()
+		board = heuristic_state_space_improved(board, state, vectorized)
+		moved = board != previous_board
+		if monitor is not None:
+			monitor.step(state.conflicts, len(board) * (len(board) - 1), moved)
+		if not moved:
+			break  # strict local maximum, sideways moves cannot help either
+		evaluations += len(board) * (len(board) - 1)
+
+	if monitor is not None:
+		monitor.finish()
+	if state.conflicts == 0:
 		print('Solved puzzle!')
 
 	print('Final state is:')
 	print_board(board)
+	return SearchResult(board, state.conflicts, i, evaluations)
 
 
 def time_to_temperature(k, kmax):
@@ -256,63 +788,467 @@ def time_to_temperature_fast(t, kmax):
     return 1 - (t / kmax) ** 2
 
 
+def time_to_temperature_slow_schedule(t, kmax):
+	# time_to_temperature_slow() does not depend on kmax
+	return time_to_temperature_slow(t)
+
+
+# Cooling schedules for anneal(), all called as schedule(time, kmax)
+COOLING_SCHEDULES = {
+	'linear': time_to_temperature,
+	'slow': time_to_temperature_slow_schedule,
+	'fast': time_to_temperature_fast,
+}
+
+
+def random_move(board):
+	"""
+	Picks a random queen and a random row to move it to.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:return: tuple of the column of the queen and its new row
+	"""
+	# Select a random column index
+	random_col = random.randint(0, len(board)-1)
+	return random_col, random.randint(0, len(board)-1)
+
+
+def random_move_batch(nqueens, count):
+	"""
+	Draws many random moves at once, so a sampler does not pay for two randint() calls per move.
+	:param nqueens: Number of queens on the board.
+	:param count: Number of moves.
+	:return: tuple of a list of columns and a list of rows, move i moves the queen in columns[i] to rows[i]
+	"""
+	rand = random.random
+	return [int(rand() * nqueens) for move in range(count)], [int(rand() * nqueens) for move in range(count)]
+
+
 def random_successor(board):
-    # Select a random column index
-    random_col = random.randint(0, len(board)-1)
-    
-    # Generate a new board by moving the queen in the random column to a random row
-    new_board = board.copy()
-    new_board[random_col] = random.randint(0, len(board)-1)
-    
-    return new_board
+	# Generate a new board by moving the queen in a random column to a random row
+	random_col, random_row = random_move(board)
+	new_board = board.copy()
+	new_board[random_col] = random_row
+
+	return new_board
 
     
-def simulated_annealing(board):
-	initial_state = board.copy()
-	current = initial_state
-	current_energy = count_conflicts(current)
-	
-	kmax = 1000
-	time = 0	
-
- 
+def anneal(board, schedule=time_to_temperature_fast, kmax=1000, monitor=None):
+	"""
+	Simulated annealing engine. Every iteration proposes moving a random queen to a random row, computes
+	the energy delta of that move in O(1) with BoardState.propose() and commits it to the board in place
+	when it is accepted, so no board is copied. The moves and acceptance draws come in batches of
+	MOVE_BATCH from random_move_batch(). Stops as soon as the energy reaches 0, when the schedule reaches
+	temperature 0 or after kmax iterations.
+	:param board: list/array representation of columns and the row of the queen on that column, changed in place
+	:param schedule: cooling schedule called as schedule(time, kmax), or the name of one in COOLING_SCHEDULES
+	:param kmax: maximum number of iterations
+	:param monitor: optional SearchMonitor that is told about every iteration
+	:return: tuple of the board, its energy (number of conflicts), the number of iterations and iterations per second
+	"""
+	if isinstance(schedule, str):
+		schedule = COOLING_SCHEDULES[schedule]
+	state = BoardState(board)
+	nqueens = len(board)
+	rand = random.random
+	exp = math.exp
+	batch = max(1, min(kmax, MOVE_BATCH))
+	start_time = timeit.default_timer()
+	iterations = 0
+
 	for time in range(kmax):
-		
-		temperature = time_to_temperature_fast(time, kmax)
-		if (temperature == 0):
-			if (time < kmax):
-				break   # breaks to return board
-			
-		next_successor = random_successor(current)
-		deltaE = count_conflicts(next_successor) - current_energy        
-		
-		if (deltaE < 0):
-			current = next_successor
-			current_energy = count_conflicts(current)
+		if state.conflicts == 0:
+			break
+		temperature = schedule(time, kmax)
+		if temperature <= 0:
+			break
+
+		index = time % batch
+		if index == 0:
+			columns, rows = random_move_batch(nqueens, batch)
+			draws = [rand() for move in range(batch)]
+		iterations += 1
+		deltaE = state.propose(columns[index], rows[index])
+		if deltaE < 0 or draws[index] < exp(-deltaE / temperature):
+			state.commit()
+			if monitor is not None:
+				monitor.step(state.conflicts)
 		else:
-			probability = math.exp(-deltaE / temperature)
-			if (random.uniform(0,1) < probability):
-				current = next_successor
-				current_energy = count_conflicts(current)
-		
-	if count_conflicts(current) == 0:
+			state.revert()
+			if monitor is not None:
+				monitor.step(state.conflicts, accepted=False)
+
+	if monitor is not None:
+		monitor.finish()
+	elapsed_time = timeit.default_timer() - start_time
+	rate = iterations / elapsed_time if elapsed_time > 0 else math.inf
+	return board, state.conflicts, iterations, rate
+
+
+def simulated_annealing(board, schedule='fast', kmax=1000, monitor=None):
+	"""
+	Runs the annealing engine on a copy of the board and prints the result and throughput.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:param schedule: cooling schedule called as schedule(time, kmax), or the name of one in COOLING_SCHEDULES
+	:param kmax: maximum number of iterations
+	:param monitor: optional SearchMonitor that is told about every iteration
+	:return: SearchResult of the run, every iteration evaluates one move
+	"""
+	current, energy, iterations, rate = anneal(board.copy(), schedule, kmax, monitor)
+
+	if energy == 0:
+		print('Solved Puzzle!')
+	else:
+		print('No Solution Found!')
+	print('Iterations: ' + str(iterations) + ' (' + str(round(rate)) + ' per second)')
+	print('Final state is:')
+	print_board(current)
+	return SearchResult(current, energy, iterations, iterations)
+
+
+def initial_temperature(state, samples=100, acceptance=0.5):
+	"""
+	Picks the starting temperature of annealing from the board itself: the temperature at which a
+	worsening move of average size is accepted with the given probability, estimated from the deltas of
+	random moves. The board is not changed.
+	:param state: BoardState of the board
+	:param samples: number of random moves sampled
+	:param acceptance: probability of accepting an average worsening move at the start
+	:return: the initial temperature, 1 if no sampled move makes the board worse
+	"""
+	columns, rows = random_move_batch(state.nqueens, samples)
+	worse = [delta for delta in map(state.delta, columns, rows) if delta > 0]
+	if not worse:
+		return 1.0
+	return -(sum(worse) / len(worse)) / math.log(acceptance)
+
+
+def adaptive_anneal(board, kmax=None, monitor=None):
+	"""
+	Simulated annealing that tunes itself to the board. The initial temperature comes from sampled move
+	deltas (initial_temperature()), the iteration budget grows with n, and the temperature cools
+	geometrically to ADAPTIVE_FINAL_TEMPERATURE of its start within ADAPTIVE_CYCLE_PER_QUEEN * n iterations.
+	When the best energy has not improved for ADAPTIVE_PATIENCE * n^2 iterations the search is stuck, and
+	it is reheated to ADAPTIVE_REHEAT of the initial temperature. The patience grows with n^2 because near
+	a solution only a few of the n^2 random moves improve the board. Stops as soon as the energy reaches 0.
+	Moves are made in place with BoardState.propose() and drawn in batches, like anneal().
+	:param board: list/array representation of columns and the row of the queen on that column, left holding
+		the best board found
+	:param kmax: maximum number of iterations, defaults to ADAPTIVE_KMAX_PER_QUEEN * n
+	:param monitor: optional SearchMonitor that is told about every iteration
+	:return: tuple of the board, its energy, the number of iterations, iterations per second and the
+		AnnealingSchedule that was used
+	"""
+	nqueens = len(board)
+	state = BoardState(board)
+	if kmax is None:
+		kmax = ADAPTIVE_KMAX_PER_QUEEN * nqueens
+	cycle = ADAPTIVE_CYCLE_PER_QUEEN * nqueens
+	patience = ADAPTIVE_PATIENCE * nqueens * nqueens
+	start_temperature = initial_temperature(state)
+	cooling_rate = ADAPTIVE_FINAL_TEMPERATURE ** (1 / cycle)
+	temperature = start_temperature
+	best_energy = state.conflicts
+	best_board = list(board)
+	last_improvement = 0
+	reheats = 0
+	rand = random.random
+	exp = math.exp
+	batch = max(1, min(kmax, MOVE_BATCH))
+	start_time = timeit.default_timer()
+	iterations = 0
+
+	for time in range(kmax):
+		if state.conflicts == 0:
+			break
+		index = time % batch
+		if index == 0:
+			columns, rows = random_move_batch(nqueens, batch)
+			draws = [rand() for move in range(batch)]
+		iterations += 1
+		deltaE = state.propose(columns[index], rows[index])
+		if deltaE <= 0 or draws[index] < exp(-deltaE / temperature):
+			state.commit()
+			if state.conflicts < best_energy:
+				best_energy = state.conflicts
+				best_board = list(board)
+				last_improvement = time
+			if monitor is not None:
+				monitor.step(state.conflicts)
+		else:
+			state.revert()
+			if monitor is not None:
+				monitor.step(state.conflicts, accepted=False)
+
+		temperature *= cooling_rate
+		if time - last_improvement >= patience:
+			temperature = start_temperature * ADAPTIVE_REHEAT
+			last_improvement = time
+			reheats += 1
+
+	if monitor is not None:
+		monitor.finish()
+	for column, row in enumerate(best_board):
+		board[column] = row
+	elapsed_time = timeit.default_timer() - start_time
+	rate = iterations / elapsed_time if elapsed_time > 0 else math.inf
+	return board, best_energy, iterations, rate, AnnealingSchedule(start_temperature, cooling_rate, kmax, reheats)
+
+
+def adaptive_simulated_annealing(board, kmax=None, monitor=None):
+	"""
+	Runs adaptive_anneal() on a copy of the board and prints the result, the schedule and throughput.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:param kmax: maximum number of iterations, defaults to ADAPTIVE_KMAX_PER_QUEEN * n
+	:param monitor: optional SearchMonitor that is told about every iteration
+	:return: SearchResult of the run, every iteration evaluates one move
+	"""
+	current, energy, iterations, rate, schedule = adaptive_anneal(board.copy(), kmax, monitor)
+
+	if energy == 0:
 		print('Solved Puzzle!')
-  
 	else:
 		print('No Solution Found!')
+	print('Schedule: initial temperature ' + str(round(schedule.initial_temperature, 3)) + ', cooling rate '
+		  + str(round(schedule.cooling_rate, 6)) + ', kmax ' + str(schedule.kmax) + ', ' + str(schedule.reheats)
+		  + ' reheats')
+	print('Iterations: ' + str(iterations) + ' (' + str(round(rate)) + ' per second)')
 	print('Final state is:')
 	print_board(current)
-	
+	return SearchResult(current, energy, iterations, iterations)
+
 
 def findFitness(board, nqueens):
 	totalnum = math.comb(nqueens, 2)	# nqueens choose 2
-	return totalnum - count_conflicts(board)
+	return totalnum - BoardState(board).conflicts
+
+
+def zobrist_halves(board):
+	"""
+	Zobrist hashes of the two halves crossover() splits a board into, the middle column going to the left
+	half. The hash of the board is their XOR, and the halves of a child are simply one half of each parent,
+	so the genetic algorithm can hash its children without looking at their queens.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:return: list of the hash of the left half and the hash of the right half
+	"""
+	nqueens = len(board)
+	keys = zobrist_keys(nqueens)
+	half = (nqueens + 1) // 2
+	left = right = 0
+	for column in range(half):
+		left ^= keys[column * nqueens + int(board[column])]
+	for column in range(half, nqueens):
+		right ^= keys[column * nqueens + int(board[column])]
+	return [left, right]
+
+
+def mutate_hashed(child, halves):
+	"""
+	mutate() that also updates the zobrist_halves() of the child with two XORs. Draws the same random
+	numbers as mutate(), so a run makes the same moves with or without hashing.
+	:param child: board to mutate in place
+	:param halves: zobrist_halves() of the child, updated in place
+	:return: the mutated child
+	"""
+	nqueens = len(child)
+	keys = zobrist_keys(nqueens)
+	column, row = random_move(child)
+	base = column * nqueens
+	halves[0 if column < (nqueens + 1) // 2 else 1] ^= keys[base + int(child[column])] ^ keys[base + row]
+	child[column] = row
+	return child
+
+
+class FitnessCache:
+	"""
+	Bounded LRU cache of findFitness() values, keyed by the 64-bit Zobrist hash of the board. Elites and
+	duplicate children then only get evaluated once, and memory stays bounded on long runs because the
+	least recently used entry is evicted once the cache holds maxsize boards. The genetic algorithm passes
+	the hashes in, built from zobrist_halves() of the parents, so looking a board up costs no rehash.
+	"""
+
+	def __init__(self, nqueens, maxsize=100000):
+		"""
+		:param nqueens: Number of queens on the boards.
+		:param maxsize: Maximum number of cached boards.
+		"""
+		self.nqueens = nqueens
+		self.maxsize = maxsize
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return len(self.entries)
+
+	def fitness(self, board, key=None):
+		"""
+		:param board: list/array representation of columns and the row of the queen on that column
+		:param key: Zobrist hash of the board if already known
+		:return: findFitness() of the board, computed only if it is not cached
+		"""
+		if key is None:
+			key = zobrist_hash(board)
+		value = self.entries.get(key)
+		if value is not None:
+			self.hits += 1
+			self.entries.move_to_end(key)
+			return value
+		self.misses += 1
+		value = findFitness(board, self.nqueens)
+		self.entries[key] = value
+		if len(self.entries) > self.maxsize:
+			self.entries.popitem(last=False)
+		return value
+
+	def evaluate(self, population, keys):
+		"""
+		Fitness of a whole population. Every distinct board that is not cached is evaluated exactly once.
+		:param population: list of boards
+		:param keys: Zobrist hash of every individual
+		:return: list with the fitness of every individual
+		"""
+		entries = self.entries
+		values = [0] * len(keys)
+		missing = {}  # hash -> indices of the individuals with that hash
+		for index, key in enumerate(keys):
+			value = entries.get(key)
+			if value is None:
+				missing.setdefault(key, []).append(index)
+			else:
+				entries.move_to_end(key)
+				values[index] = value
+		self.hits += len(keys) - len(missing)
+		self.misses += len(missing)
+
+		if missing:
+			for key, indices in missing.items():
+				value = findFitness(population[indices[0]], self.nqueens)
+				entries[key] = value
+				for index in indices:
+					values[index] = value
+			while len(entries) > self.maxsize:
+				entries.popitem(last=False)
+		return values
+
+
+def population_fitness(population):
+	"""
+	Fitness of every individual of a population in one vectorized pass. Queens are counted per row and
+	diagonal of every board with a single bincount over offset line indices, and the conflicts of a board
+	are the sum of (k choose 2) over its lines. Requires NumPy.
+	:param population: 2-D NumPy array with one board per row
+	:return: NumPy array with the findFitness() value of every individual
+	"""
+	size, nqueens = population.shape
+	columns = np.arange(nqueens)
+	lines = population.astype(np.intp)
+	conflicts = np.zeros(size, dtype=np.int64)
+	for line_index, line_count in ((lines, nqueens),
+								   (columns - lines + nqueens - 1, 2 * nqueens - 1),
+								   (columns + lines, 2 * nqueens - 1)):
+		offsets = (np.arange(size) * line_count)[:, None]
+		counts = np.bincount((line_index + offsets).ravel(), minlength=size * line_count)
+		conflicts += (counts * (counts - 1) // 2).reshape(size, line_count).sum(axis=1)
+	return math.comb(nqueens, 2) - conflicts
 
 
 def randomSelection(population, weights):
 	return random.choices(population, weights=weights)[0]
 
 
+def roulette_selection(weights, count):
+	"""
+	Fitness proportionate selection with replacement. The cumulative weights are built once and every
+	parent is drawn with a binary search, so drawing all parents of a generation is O(P log P) instead of
+	the O(P) per draw of randomSelection().
+	:param weights: fitness of every individual
+	:param count: number of parents to draw
+	:return: list with the indices of the selected individuals
+	"""
+	cumulative = list(itertools.accumulate(weights))
+	total = cumulative[-1]
+	last = len(cumulative) - 1
+	if total <= 0:  # no individual has any fitness, select uniformly
+		return [int(random.random() * len(cumulative)) for parent in range(count)]
+	return [bisect.bisect(cumulative, random.random() * total, 0, last) for parent in range(count)]
+
+
+def stochastic_universal_sampling(weights, count):
+	"""
+	Fitness proportionate selection with a single spin: count equally spaced pointers over the cumulative
+	weights, walked in one pass. Every individual is selected close to its expected number of times.
+	The selection is shuffled so that consecutive parents are not neighbours in the population.
+	:param weights: fitness of every individual
+	:param count: number of parents to draw
+	:return: list with the indices of the selected individuals
+	"""
+	cumulative = list(itertools.accumulate(weights))
+	total = cumulative[-1]
+	if count == 0:
+		return []
+	if total <= 0:  # no individual has any fitness, select uniformly
+		return [int(random.random() * len(cumulative)) for parent in range(count)]
+	step = total / count
+	start = random.random() * step
+	last = len(cumulative) - 1
+	selected = []
+	index = 0
+	for parent in range(count):
+		# computed from the start instead of summed up, and bounded, so rounding cannot run past the end
+		pointer = start + parent * step
+		while index < last and cumulative[index] <= pointer:
+			index += 1
+		selected.append(index)
+	random.shuffle(selected)
+	return selected
+
+
+def tournament_selection(weights, count, tournament_size=3):
+	"""
+	Tournament selection: every parent is the fittest of tournament_size individuals drawn uniformly.
+	:param weights: fitness of every individual
+	:param count: number of parents to draw
+	:param tournament_size: number of individuals per tournament
+	:return: list with the indices of the selected individuals
+	"""
+	size = len(weights)
+	rand = random.random
+	selected = []
+	for parent in range(count):
+		best = int(rand() * size)
+		for contestant in range(tournament_size - 1):
+			other = int(rand() * size)
+			if weights[other] > weights[best]:
+				best = other
+		selected.append(best)
+	return selected
+
+
+# Parent selection methods of the genetic algorithm, all called as method(weights, count)
+SELECTION_METHODS = {
+	'roulette': roulette_selection,
+	'sus': stochastic_universal_sampling,
+	'tournament': tournament_selection,
+}
+
+
+def select_elite(fitness, count):
+	"""
+	Partial selection of the fittest individuals, keyed on fitness only. Uses argpartition for a NumPy
+	fitness vector and a heap otherwise, both O(P) for a small count instead of sorting the population.
+	:param fitness: fitness of every individual, as a list or NumPy array
+	:param count: number of individuals to keep
+	:return: indices of the count fittest individuals, in no particular order
+	"""
+	size = len(fitness)
+	count = min(count, size)
+	if count <= 0:
+		return []
+	if np is not None and isinstance(fitness, np.ndarray):
+		return np.argpartition(fitness, size - count)[size - count:]
+	return heapq.nlargest(count, range(size), key=fitness.__getitem__)
+
+
 def split_list(a_list):
 	half = len(a_list) // 2
 	if len(a_list) % 2 == 0:
@@ -322,11 +1258,30 @@ def split_list(a_list):
 
 
 def crossover(parent1, parent2):
-	child1left, child2right = split_list(parent1.copy())
-	child2left, child1right = split_list(parent2.copy())
+	# Slicing already copies, so the parents are left untouched
+	child1left, child2right = split_list(parent1)
+	child2left, child1right = split_list(parent2)
 	return (child1left + child1right), (child2left + child2right)
 
 
+def crossover_population(population, parents1, parents2):
+	"""
+	Vectorized crossover() of many pairs of parents at once.
+	:param population: 2-D NumPy array with one board per row
+	:param parents1: indices of the first parent of every pair
+	:param parents2: indices of the second parent of every pair
+	:return: 2-D NumPy array with the two children of pair i in rows 2i and 2i + 1
+	"""
+	nqueens = population.shape[1]
+	half = (nqueens + 1) // 2  # split_list() puts the middle queen in the left half
+	children = np.empty((2 * len(parents1), nqueens), dtype=population.dtype)
+	children[0::2, :half] = population[parents1, :half]
+	children[0::2, half:] = population[parents2, half:]
+	children[1::2, :half] = population[parents2, :half]
+	children[1::2, half:] = population[parents1, half:]
+	return children
+
+
 def reproduce(parent1, parent2):
 	child1, child2 = crossover(parent1, parent2)
 	return child1, child2
@@ -341,77 +1296,593 @@ def mutate(child):
 	return child
 
 
-def evaluatePopulation(population, nqueens, maxFitness):
+def evaluatePopulation(population, nqueens, maxFitness, fitness=None):
+	"""
+	:param fitness: fitness of every individual if already known, as a list or NumPy array
+	:return: index of the first individual with the maximal fitness, or -1
+	"""
+	if fitness is None:
+		fitness = [findFitness(individual, nqueens) for individual in population]
+	if np is not None and isinstance(fitness, np.ndarray):
+		solutions = np.flatnonzero(fitness == maxFitness)
+		return int(solutions[0]) if len(solutions) else -1
 	for idx in range(len(population)):
-		if (findFitness(population[idx], nqueens) == maxFitness):
+		if (fitness[idx] == maxFitness):
 			return idx
 	return -1
 
 
-def genetic_algorithm(board):
+def breed(population, fitness, elitism_num, selection='roulette', halves=None):
+	"""
+	Builds the next generation of a population of boards: the elite plus as many children as needed to
+	keep the population size, made with reproduce() from parents drawn in one batch and mutated with
+	probability 0.2.
+	:param population: list of boards
+	:param fitness: fitness of every individual
+	:param elitism_num: number of best individuals transferred unchanged
+	:param selection: name of the parent selection method in SELECTION_METHODS
+	:param halves: optional zobrist_halves() of every individual, to get those of the new population too
+	:return: list with the new population, or a tuple of it and its halves when halves are given
+	"""
+	population_size = len(population)
+	pairs = (population_size - elitism_num + 1) // 2
+	parents = SELECTION_METHODS[selection](fitness, 2 * pairs)
+
+	# add best individuals to new population
+	elite = select_elite(fitness, elitism_num)
+	new_population = [population[i] for i in elite]
+	new_halves = [list(halves[i]) for i in elite] if halves is not None else None
+	for pair in range(pairs):
+		parent1, parent2 = parents[2 * pair], parents[2 * pair + 1]
+		child1, child2 = reproduce(population[parent1], population[parent2])
+		if halves is None:
+			if (random.uniform(0,1) < 0.2):
+				child1 = mutate(child1)
+			if (random.uniform(0,1) < 0.2):
+				child2 = mutate(child2)
+		else:
+			halves1 = [halves[parent1][0], halves[parent2][1]]
+			halves2 = [halves[parent2][0], halves[parent1][1]]
+			if (random.uniform(0,1) < 0.2):
+				child1 = mutate_hashed(child1, halves1)
+			if (random.uniform(0,1) < 0.2):
+				child2 = mutate_hashed(child2, halves2)
+			new_halves.append(halves1)
+			new_halves.append(halves2)
+		new_population.append(child1)
+		new_population.append(child2)
+	if halves is None:
+		return new_population[:population_size]
+	return new_population[:population_size], new_halves[:population_size]
+
+
+def genetic_algorithm(board, maxtime=10, vectorized=None, selection='roulette', elitism_num=10, cache_size=0,
+					  warm_start=False, evaluator=None, max_generations=None):
+	"""
+	Genetic algorithm with elitism, batched parent selection, single point crossover and mutation.
+	The population keeps its initial size: every generation is the elite plus enough children to fill it.
+	Fitness is computed once per individual per generation and used for both the selection and the check
+	for a solution.
+	:param board: list/array representation of a board, only its size is used
+	:param maxtime: number of seconds after which the search gives up
+	:param vectorized: store the population as a 2-D NumPy array and compute all fitness values in one
+		pass with population_fitness(), defaults to True when NumPy is available and no cache_size is given
+	:param selection: name of the parent selection method in SELECTION_METHODS, all parents of a
+		generation are drawn in one batch
+	:param elitism_num: number of best individuals transferred unchanged to the next generation
+	:param cache_size: maximum size of a FitnessCache for the list based population, 0 or None (the
+		default) disables it. Children are hashed from the zobrist_halves() of their parents and only
+		boards missing from the cache are evaluated. Only worth it when most children are duplicates: with
+		the usual 5-30% hit rate the bookkeeping costs more than the findFitness() calls it saves. A
+		cache_size selects the list based population; the vectorized population is never cached, since
+		population_fitness() is cheaper than a lookup, so combining it with vectorized=True is a ValueError
+	:param warm_start: start from perturbed constructive solutions made by init_board_constructive()
+		instead of random boards, with between 1 and n / 2 swaps each so the population is diverse. The
+		random rotation and shift of every warm start keep the runs from converging on the same solution
+	:param evaluator: callable computing the fitness of a whole vectorized population instead of
+		population_fitness(), e.g. a nqueens_parallel.SharedFitnessEvaluator that evaluates it in worker
+		processes; requires vectorized
+	:param max_generations: number of generations after which the search gives up, no limit by default
+	:return: SearchResult with the solution, or the fittest individual if time ran out; evaluations only
+		count boards whose fitness was actually computed
+	"""
 	startTime = timeit.default_timer()
 	nqueens = len(board)
-	population = [init_board(nqueens) for j in range(nqueens) for k in range(100)]
-	maxtime = 10
+	if vectorized is None:
+		vectorized = np is not None and not cache_size
+	if evaluator is not None and not vectorized:
+		raise ValueError('An evaluator requires the vectorized population')
+	if cache_size and vectorized:
+		raise ValueError('The fitness cache requires the list based population')
+	if warm_start:
+		population = [init_board_constructive(nqueens, random.randint(1, max(1, nqueens // 2)))
+					  for j in range(nqueens) for k in range(100)]
+	else:
+		population = [init_board(nqueens) for j in range(nqueens) for k in range(100)]
+	if vectorized:
+		population = np.array(population, dtype=np.int16)
+	population_size = len(population)
 	maxFitness = math.comb(nqueens, 2)
-	elitism_num = 10  # number of best individuals to transfer to next generation
-	
-	while True:
+	elitism_num = max(0, min(elitism_num, population_size))
+	pairs = (population_size - elitism_num + 1) // 2  # used by the vectorized path, breed() does its own
+	select_parents = SELECTION_METHODS[selection]
+	generations = 0
+	cache = FitnessCache(nqueens, cache_size) if cache_size else None
+	halves = [zobrist_halves(individual) for individual in population] if cache is not None else None
+	evaluations = 0
+
+	def evaluate(population):
+		if cache is not None:
+			return cache.evaluate(population, [left ^ right for left, right in halves])
+		if evaluator is not None:
+			return evaluator(population)
+		if vectorized:
+			return population_fitness(population)
+		return [findFitness(individual, nqueens) for individual in population]
+
+	fitness = evaluate(population)
+	evaluations += population_size if cache is None else 0
+	evalResult = evaluatePopulation(population, nqueens, maxFitness, fitness)
+
+	while evalResult == -1:
 		elapsed_time = timeit.default_timer() - startTime
 		
 		if (elapsed_time > maxtime):
 			print('Time exceeded')
 			break
+		if max_generations is not None and generations >= max_generations:
+			print('Generation limit reached')
+			break
+		generations += 1
+
+		if vectorized:
+			parents = select_parents(fitness.tolist(), 2 * pairs)
+			parents1 = parents[0::2]
+			parents2 = parents[1::2]
+			elite = population[select_elite(fitness, elitism_num)]
+			children = crossover_population(population, parents1, parents2)[:population_size - elitism_num]
+			for child in children:
+				if (random.uniform(0,1) < 0.2):
+					mutate(child)
+			population = np.concatenate((elite, children))
+		elif halves is None:
+			population = breed(population, fitness, elitism_num, selection)
+		else:
+			population, halves = breed(population, fitness, elitism_num, selection, halves)
 
-		new_population = []
-		weights = [findFitness(population[i], len(population[0])) for i in range(len(population))]
-		sorted_population = [p for _, p in sorted(zip(weights, population), reverse=True)]
-		new_population.extend(sorted_population[:elitism_num])  # add best individuals to new population
-		
-		for idx in range(elitism_num, len(population)):
-			if (elapsed_time > maxtime):
-				print('Time exceeded')
-				break
-			x = randomSelection(population, weights)
-			y = randomSelection(population, weights)
-			child1, child2 = reproduce(x,y)
-			if (random.uniform(0,1) < 0.2):
-				child1 = mutate(child1)
-			if (random.uniform(0,1) < 0.2):
-				child2 = mutate(child2)
-			new_population.append(child1)
-			new_population.append(child2)
-
-		print('Broken out of for loop')
-		print(len(population))
-		
-		population = new_population
+		fitness = evaluate(population)
+		evaluations += population_size if cache is None else 0
+		evalResult = evaluatePopulation(population, nqueens, maxFitness, fitness)
 
-		evalResult = evaluatePopulation(population, nqueens, maxFitness)
-		if (evalResult != -1):
-			print('Solved Puzzle!')
-			print('Final state is:')
-			print_board(population[evalResult])
-			break
+	if (evalResult != -1):
+		best_index = evalResult
+		print('Solved Puzzle!')
+		print('Final state is:')
+		print_board(population[best_index])
+	else:
+		best_index = max(range(population_size), key=fitness.__getitem__)
 
 	endtime = timeit.default_timer()
 	print('Time is ' + str(endtime - startTime))
-	
+	if cache is not None:
+		evaluations = cache.misses
+		print('Fitness cache: ' + str(cache.hits) + ' hits, ' + str(cache.misses) + ' misses')
+	best = population[best_index]
+	best = best.tolist() if vectorized else list(best)
+	return SearchResult(best, maxFitness - int(fitness[best_index]), generations, evaluations)
+
+
+def init_board_greedy(nqueens, tries=50):
+	"""
+	Greedy, nearly conflict-free initialization. Every column gets a random row that is not used yet and
+	has no queen on either of its diagonals, trying a few random rows before settling for the last one.
+	The result is a permutation, so only diagonal conflicts remain, and these are few and end up in
+	the last columns where almost no rows are left.
+	:param nqueens: integer for the number of queens on the board
+	:param tries: number of random rows tried per column before accepting a conflict
+	:return: list/array representation of columns and the row of the queen on that column
+	"""
+	rand = random.random
+	offset = nqueens - 1
+	board = [0] * nqueens
+	free_rows = list(range(nqueens))  # the rows not used yet are free_rows[:remaining]
+	diagonals = bytearray(2 * nqueens - 1)
+	anti_diagonals = bytearray(2 * nqueens - 1)
+	remaining = nqueens
+
+	for column in range(nqueens):
+		for attempt in range(tries):
+			index = int(rand() * remaining)
+			row = free_rows[index]
+			if not diagonals[column - row + offset] and not anti_diagonals[column + row]:
+				break
+		board[column] = row
+		diagonals[column - row + offset] = 1
+		anti_diagonals[column + row] = 1
+		remaining -= 1
+		free_rows[index] = free_rows[remaining]
+
+	return board
+
+
+def constructive_board(nqueens):
+	"""
+	Closed-form solution for any number of queens except 2 and 3, built in O(n) without any search. Using
+	rows counted from 1, the queens go on the even rows followed by the odd rows, in increasing order. That
+	only fails when n mod 6 is 2 or 3, which is repaired by reordering a few rows: for n mod 6 = 2 the odd
+	rows become 3, 1, 7, 9, ..., 5, and for n mod 6 = 3 the even rows become 4, 6, ..., 2 and the odd rows
+	5, 7, ..., 1, 3.
+	:param nqueens: integer for the number of queens on the board
+	:return: list/array representation of columns and the row of the queen on that column, None for 2 and 3
+	"""
+	if nqueens in (2, 3):
+		return None
+	evens = list(range(2, nqueens + 1, 2))
+	odds = list(range(1, nqueens + 1, 2))
+	if nqueens % 6 == 2:
+		odds = [3, 1] + odds[3:] + [5]
+	elif nqueens % 6 == 3:
+		evens = evens[1:] + [2]
+		odds = odds[2:] + [1, 3]
+	return [row - 1 for row in evens + odds]
+
+
+def init_board_constructive(nqueens, swaps=None):
+	"""
+	Warm start for the local searches: a variant of the constructive_board() solution. The solution is
+	mirrored at random left to right and top to bottom. Its columns are rotated and its rows shifted by
+	random amounts of at most max(4, swaps), wrapping around the board, and then a few random pairs of
+	distinct columns are swapped. Every queen keeps its own row, so only the diagonal conflicts along the
+	wrap seams and the swaps are left to repair. Because the rotation and shift differ from call to call, there is no single solution
+	that crossing two warm starts could rebuild, and the searches end in many different solutions. A
+	variant that is a solution already is drawn again, so there is always something left to repair
+	(except for a single queen). Falls back to init_board() when there is no constructive solution.
+	:param nqueens: integer for the number of queens on the board
+	:param swaps: number of random column swaps, defaults to one per 8 queens with a minimum of one
+	:return: list/array representation of columns and the row of the queen on that column
+	"""
+	solution = constructive_board(nqueens)
+	if solution is None:
+		return init_board(nqueens)
+	if random.random() < 0.5:
+		solution.reverse()
+	if random.random() < 0.5:
+		solution = [nqueens - 1 - row for row in solution]
+	if swaps is None:
+		swaps = max(1, nqueens // 8)
+	reach = max(4, swaps)  # a rotation or shift by k adds about k conflicts, as many as k swaps
+	start = solution
+	while nqueens > 1 and BoardState(start).conflicts == 0:
+		rotation = random.randint(-reach, reach) % nqueens
+		shift = random.randint(-reach, reach) % nqueens
+		start = [(solution[(column + rotation) % nqueens] + shift) % nqueens for column in range(nqueens)]
+		for swap in range(swaps):
+			column, other_column = random.sample(range(nqueens), 2)
+			start[column], start[other_column] = start[other_column], start[column]
+	return start
+
+
+def min_conflicts(board, max_steps=None, sample_size=1000, monitor=None):
+	"""
+	Min-conflicts local search. Repeatedly takes a random conflicted queen and moves it to the row in
+	its column with the fewest conflicts, breaking ties at random. The queen always moves, even if every
+	other row is worse, which keeps the search from getting stuck in a local minimum.
+	Conflicts are tracked incrementally with a BoardState and the conflicted columns are kept in a list:
+	a queen that a move lands on is added right away, queens that are no longer in conflict are dropped
+	lazily when picked, and the list is only rebuilt if it runs empty while conflicts remain. Boards of
+	at most sample_size queens scan the whole column and rebuild the list every move; larger boards
+	score the empty rows plus sample_size random rows instead.
+	Start from init_board_greedy() to solve a million queens in seconds.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:param max_steps: give up after this many moves, defaults to 100 * n
+	:param sample_size: number of random rows scored per move on large boards
+	:param monitor: optional SearchMonitor that is told about every move
+	:return: SearchResult of the run
+	"""
+	nqueens = len(board)
+	if max_steps is None:
+		max_steps = 100 * nqueens
+	rand = random.random
+	state = BoardState(board)
+	rows, diagonals, anti_diagonals = state.rows, state.diagonals, state.anti_diagonals
+	offset = nqueens - 1
+
+	# The last queen placed on every row and diagonal. On a nearly conflict-free board a line rarely
+	# holds more than two queens, so this finds the queen a move lands on without scanning the board.
+	row_owner = [-1] * nqueens
+	diagonal_owner = [-1] * (2 * nqueens - 1)
+	anti_diagonal_owner = [-1] * (2 * nqueens - 1)
+	for column, row in enumerate(board):
+		row_owner[row] = column
+		diagonal_owner[column - row + offset] = column
+		anti_diagonal_owner[column + row] = column
+	empty_rows = {row for row in range(nqueens) if rows[row] == 0}
+	conflicted = state.conflicted_columns()
+	steps = 0
+	evaluations = 0
+
+	while state.conflicts != 0 and steps < max_steps:
+		if not conflicted or nqueens <= sample_size:
+			conflicted = state.conflicted_columns()
+		index = int(rand() * len(conflicted))
+		column = conflicted[index]
+		current_cost = state.queen_conflicts(column)
+		if current_cost == 0:
+			conflicted[index] = conflicted[-1]
+			conflicted.pop()
+			continue
+
+		steps += 1
+		old_row = board[column]
+		if nqueens <= sample_size:
+			candidates = range(nqueens)
+		else:
+			candidates = [int(rand() * nqueens) for sample in range(sample_size)]
+			candidates.extend(empty_rows)
+
+		best_cost = math.inf
+		best_rows = []
+		evaluations += len(candidates)
+		for row in candidates:
+			if row == old_row:
+				continue
+			cost = rows[row] + diagonals[column - row + offset] + anti_diagonals[column + row]
+			if cost < best_cost:
+				best_cost = cost
+				best_rows = [row]
+			elif cost == best_cost:
+				best_rows.append(row)
+		if not best_rows:
+			continue
+
+		row = random.choice(best_rows)
+		state.move(column, row)
+		if rows[old_row] == 0:
+			empty_rows.add(old_row)
+		empty_rows.discard(row)
+		if best_cost != 0:
+			for owners, line in ((row_owner, row), (diagonal_owner, column - row + offset),
+								 (anti_diagonal_owner, column + row)):
+				other = owners[line]
+				if other != -1 and other != column and state.queen_conflicts(other) != 0:
+					conflicted.append(other)
+		row_owner[row] = column
+		diagonal_owner[column - row + offset] = column
+		anti_diagonal_owner[column + row] = column
+		if best_cost == 0:
+			conflicted[index] = conflicted[-1]
+			conflicted.pop()
+		if monitor is not None:
+			monitor.step(state.conflicts, len(candidates))
+
+	if monitor is not None:
+		monitor.finish()
+
+	if state.conflicts == 0:
+		print('Solved puzzle!')
+	else:
+		print('No Solution Found! ' + str(state.conflicts) + ' conflicts left')
+	print('Moves: ' + str(steps))
+	print('Final state is:')
+	print_board(board)
+	return SearchResult(board, state.conflicts, steps, evaluations)
+
+
+def tabu_search(board, max_iterations=1000, tenure=10, monitor=None):
+	"""
+	Tabu search. Every iteration makes the best move of a conflicted queen, even if it makes the board
+	worse, except for moves on the tabu list: after a queen leaves a square, moving it back there is tabu
+	for the next tenure moves, which stops the search from cycling on a plateau. A tabu move is still
+	allowed if it would beat the best number of conflicts found so far (aspiration). Moves are scored with
+	the O(1) conflict deltas of a BoardState and the tabu list is a deque with a set next to it for O(1)
+	membership checks.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:param max_iterations: give up after this many moves
+	:param tenure: number of moves a square stays tabu
+	:param monitor: optional SearchMonitor that is told about every iteration
+	:return: SearchResult with the best board found, which is also left in board
+	"""
+	nqueens = len(board)
+	state = BoardState(board)
+	tabu_list = deque()
+	tabu_squares = set()  # column * n + row of every square in tabu_list
+	best_conflicts = state.conflicts
+	best_board = list(board)
+	evaluations = 0
+	i = 0
+
+	while state.conflicts != 0 and i < max_iterations:
+		i += 1
+		best_delta = math.inf
+		best_moves = []
+		conflicted = state.conflicted_columns()
+		for column in conflicted:
+			current_row = board[column]
+			for row in range(nqueens):
+				if row == current_row:
+					continue
+				delta = state.delta(column, row)
+				if column * nqueens + row in tabu_squares and state.conflicts + delta >= best_conflicts:
+					continue
+				if delta < best_delta:
+					best_delta = delta
+					best_moves = [(column, row)]
+				elif delta == best_delta:
+					best_moves.append((column, row))
+			evaluations += nqueens - 1
+		if not best_moves:
+			if monitor is not None:
+				monitor.step(state.conflicts, len(conflicted) * (nqueens - 1), False)
+			if tabu_list:
+				tabu_squares.discard(tabu_list.popleft())  # every move is tabu, expire the oldest early
+			continue
+
+		column, row = random.choice(best_moves)
+		tabu_list.append(column * nqueens + board[column])
+		tabu_squares.add(tabu_list[-1])
+		if len(tabu_list) > tenure:
+			tabu_squares.discard(tabu_list.popleft())
+		state.move(column, row)
+		if state.conflicts < best_conflicts:
+			best_conflicts = state.conflicts
+			best_board = list(board)
+		if monitor is not None:
+			monitor.step(state.conflicts, len(conflicted) * (nqueens - 1))
+
+	if monitor is not None:
+		monitor.finish()
+	for column, row in enumerate(best_board):
+		board[column] = row
+	if best_conflicts == 0:
+		print('Solved puzzle!')
+
+	print('Final state is:')
+	print_board(board)
+	return SearchResult(board, best_conflicts, i, evaluations)
 
 
+def constructive(board):
+	"""
+	Solves the board directly with constructive_board(), no search involved.
+	:param board: list/array representation of a board, filled in place with the solution
+	:return: SearchResult of the run, the board is left unchanged for 2 and 3 queens
+	"""
+	solution = constructive_board(len(board))
+	if solution is None:
+		conflicts = BoardState(board).conflicts
+		print('No Solution Found! There is no solution for ' + str(len(board)) + ' queens')
+	else:
+		for column, row in enumerate(solution):
+			board[column] = row
+		conflicts = 0
+		print('Solved puzzle!')
+
+	print('Final state is:')
+	print_board(board)
+	return SearchResult(board, conflicts, 0, 0)
+
+
+# Solvers by name, for runners that pick an algorithm without the main() menu. Every solver takes a
+# board as its first argument and returns a SearchResult.
+SOLVERS = {
+	'random': random_search,
+	'hill_climbing_pseudo_code': hill_climbing_pseudo_code,
+	'hill_climbing_improved': hill_climbing_improved,
+	'simulated_annealing': simulated_annealing,
+	'adaptive_simulated_annealing': adaptive_simulated_annealing,
+	'genetic_algorithm': genetic_algorithm,
+	'min_conflicts': min_conflicts,
+	'tabu_search': tabu_search,
+	'constructive': constructive,
+}
+
+# Solvers that handle up to MAXQ_MIN_CONFLICTS queens, the others are limited to MAXQ
+LARGE_BOARD_SOLVERS = ('min_conflicts', 'constructive')
+
+
+def run_batch(algorithm, nqueens, seed=0, repeats=1, time_budget=None, output=None, warm_start=False):
+	"""
+	Runs a solver repeatedly without any prompts or board printing, and writes one compact JSON line per
+	run with the algorithm, n, seed, whether it was solved, the final board, its conflicts, the iterations,
+	the evaluations and the wall time. Run k uses seed + k.
+	:param algorithm: Name of the solver in SOLVERS.
+	:param nqueens: Number of queens on the board.
+	:param seed: Seed of the first run.
+	:param repeats: Number of runs.
+	:param time_budget: Seconds for the whole batch. No run is started once it is used up, and the genetic
+		algorithm gets the remaining budget as its time limit.
+	:param output: Text stream the lines are written to, buffered stdout when not given.
+	:param warm_start: Start every run from init_board_constructive(), the genetic algorithm from a
+		population of such boards.
+	:return: Number of runs written.
+	"""
+	if output is None:
+		output = io.open(sys.stdout.fileno(), 'w', buffering=1 << 16, closefd=False)
+	start_time = timeit.default_timer()
+	runs = 0
+
+	with open(os.devnull, 'w') as devnull:
+		for run in range(repeats):
+			remaining = None if time_budget is None else time_budget - (timeit.default_timer() - start_time)
+			if remaining is not None and remaining <= 0:
+				break
+			options = {'maxtime': remaining} if algorithm == 'genetic_algorithm' and remaining is not None else {}
+			if algorithm == 'genetic_algorithm' and warm_start:
+				options['warm_start'] = True
+
+			random.seed(seed + run)
+			if warm_start:
+				board = init_board_constructive(nqueens)
+			elif algorithm == 'min_conflicts':
+				board = init_board_greedy(nqueens)
+			else:
+				board = init_board(nqueens)
+			run_start = timeit.default_timer()
+			with contextlib.redirect_stdout(devnull):
+				result = SOLVERS[algorithm](board, **options)
+			wall_time = timeit.default_timer() - run_start
+
+			output.write(json.dumps({
+				'algorithm': algorithm,
+				'n': nqueens,
+				'seed': seed + run,
+				'solved': result.conflicts == 0,
+				'solution': list(result.board),
+				'conflicts': result.conflicts,
+				'iterations': result.iterations,
+				'evaluations': result.evaluations,
+				'wall_time': round(wall_time, 6),
+			}, separators=(',', ':')))
+			output.write('\n')
+			runs += 1
+
+	output.flush()
+	return runs
+
+
+def batch_main(arguments):
+	"""
+	Non-interactive mode of main(), used when any option is given:
+	python nqueens.py NUMBER --algorithm NAME [--seed S] [--repeats R] [--time-budget SECONDS] [--output FILE]
+	[--warm-start]
+	"""
+	parser = argparse.ArgumentParser(prog='nqueens.py', description='Run an N-Queens solver and stream the runs as JSON lines.')
+	parser.add_argument('n_queens', type=int, metavar='NUMBER', help='number of queens')
+	parser.add_argument('--algorithm', required=True, choices=list(SOLVERS), help='solver to run')
+	parser.add_argument('--seed', type=int, default=0, help='seed of the first run, run k uses seed + k')
+	parser.add_argument('--repeats', type=int, default=1, help='number of runs')
+	parser.add_argument('--time-budget', type=float, default=None, help='seconds for the whole batch')
+	parser.add_argument('--output', default='-', help='JSON lines file, - for stdout')
+	parser.add_argument('--warm-start', action='store_true', help='start from perturbed constructive solutions')
+	args = parser.parse_args(arguments)
+
+	maximum = MAXQ_MIN_CONFLICTS if args.algorithm in LARGE_BOARD_SOLVERS else MAXQ
+	if args.n_queens < 1 or args.n_queens > maximum:
+		parser.error('NUMBER must be between 1 and ' + str(maximum) + ' for ' + args.algorithm)
+
+	if args.output == '-':
+		return run_batch(args.algorithm, args.n_queens, args.seed, args.repeats, args.time_budget,
+						 warm_start=args.warm_start)
+	with open(args.output, 'w', buffering=1 << 16) as output:
+		return run_batch(args.algorithm, args.n_queens, args.seed, args.repeats, args.time_budget, output,
+						 args.warm_start)
+
 
 def main():
 	"""
 	Main function that will parse input and call the appropriate algorithm. You do not need to understand everything
-	here!
+	here! With options after the number it runs in batch mode instead, see batch_main().
 	"""
 
+	if len(sys.argv) > 2:
+		return batch_main(sys.argv[1:])
+
 	try:
 		if len(sys.argv) != 2:
 			raise ValueError
 
 		n_queens = int(sys.argv[1])
-		if n_queens < 1 or n_queens > MAXQ:
+		if n_queens < 1 or n_queens > MAXQ_MIN_CONFLICTS:
 			raise ValueError
 
 	except ValueError:
@@ -419,33 +1890,48 @@ def main():
 		return False
 
 	print('Which algorithm to use?')
-	algorithm = input('1: random, 2: hill-climbing (pseudo code), 3: hill-climbing (improved), 4: simulated annealing 5: Genetic Algorithm\n')
+	algorithm = input('1: random, 2: hill-climbing (pseudo code), 3: hill-climbing (improved), 4: simulated annealing 5: Genetic Algorithm 6: min-conflicts 7: tabu search 8: constructive 9: adaptive simulated annealing\n')
 
 	try:
 		algorithm = int(algorithm)
 
-		if algorithm not in range(1, 6):
+		if algorithm not in range(1, 10):
 			raise ValueError
 
 	except ValueError:
 		print('Please input a number in the given range!')
 		return False
 
-	board = init_board(n_queens)
+	if algorithm not in (6, 8) and n_queens > MAXQ:
+		print('Only min-conflicts and constructive support more than ' + str(MAXQ) + ' queens')
+		return False
+
+	if algorithm == 6:
+		board = init_board_greedy(n_queens)
+	else:
+		board = init_board(n_queens)
 	print('Initial board: \n')
 	print_board(board)
 
+	monitor = SearchMonitor(PROGRESS_INTERVAL)
 	if algorithm == 1:
-		random_search(board)
+		random_search(board, monitor=monitor)
 	if algorithm == 2:
-		hill_climbing_pseudo_code(board)
+		hill_climbing_pseudo_code(board, monitor=monitor)
 	if algorithm == 3:
-		hill_climbing_improved(board)
+		hill_climbing_improved(board, monitor=monitor)
 	if algorithm == 4:
-		simulated_annealing(board)
+		simulated_annealing(board, monitor=monitor)
 	if algorithm == 5:
 		genetic_algorithm(board)
-		
+	if algorithm == 6:
+		min_conflicts(board, monitor=monitor)
+	if algorithm == 7:
+		tabu_search(board, monitor=monitor)
+	if algorithm == 8:
+		constructive(board)
+	if algorithm == 9:
+		adaptive_simulated_annealing(board, monitor=SearchMonitor(PROGRESS_INTERVAL * 100))
 
 
 # This line is the starting point of the program.
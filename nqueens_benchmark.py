@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+import platform
+import statistics
+import contextlib
+
+import nim
+import nqueens
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'benchmark_baseline.json')
+SEEDS = (0, 1, 2)
+REPEAT = 7  # measurements per case, the median is compared
+GENETIC_GENERATIONS = 50  # generation budget of the genetic_algorithm cases, so that larger boards end in time
+THRESHOLD = 0.6  # relative slowdown flagged as a regression, identical runs differ by up to about 45%
+
+
+def silently(function):
+	"""
+	Wraps a function so that whatever it prints is discarded while it is timed.
+	"""
+	def wrapper():
+		with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+			function()
+	return wrapper
+
+
+def seeded_board(nqueens_count, seed):
+	random.seed(seed)
+	return nqueens.init_board(nqueens_count)
+
+
+def count_conflicts_case(nqueens_count, seed):
+	board = seeded_board(nqueens_count, seed)
+	return lambda: nqueens.count_conflicts(board)
+
+
+def heuristic_state_space_case(nqueens_count, seed):
+	board = seeded_board(nqueens_count, seed)
+
+	def run():
+		random.seed(seed)
+		nqueens.heuristic_state_space(board.copy())
+	return run
+
+
+def simulated_annealing_case(nqueens_count, seed):
+	board = seeded_board(nqueens_count, seed)
+
+	def run():
+		random.seed(seed)
+		nqueens.simulated_annealing(board)
+	return silently(run)
+
+
+def genetic_algorithm_case(nqueens_count, seed):
+	board = seeded_board(nqueens_count, seed)
+
+	def run():
+		random.seed(seed)
+		nqueens.genetic_algorithm(board, max_generations=GENETIC_GENERATIONS)
+	return silently(run)
+
+
+def negamax_decision_case(state, seed):
+	return lambda: nim.negamax_decision(state, 10)
+
+
+def minimax_decision_case(state, turn):
+	return lambda: nim.minimax_decision(state, turn)
+
+
+# Benchmark name -> (case factory taking (size, seed), problem sizes, seeds). For nim the size is the number of
+# matches; the nim searches are deterministic, so negamax runs once per size and minimax once per player to move.
+BENCHMARKS = {
+	'count_conflicts': (count_conflicts_case, (8, 32, 100), SEEDS),
+	'heuristic_state_space': (heuristic_state_space_case, (8, 16, 32), SEEDS),
+	'simulated_annealing': (simulated_annealing_case, (8, 16, 32), SEEDS),
+	'genetic_algorithm': (genetic_algorithm_case, (8, 12, 16), SEEDS),
+	'negamax_decision': (negamax_decision_case, (20, 40, 80), (None,)),
+	'minimax_decision': (minimax_decision_case, (10, 14, 18), (0, 1)),
+}
+
+
+def case_key(name, size, seed):
+	if seed is None:
+		return name + '[n=' + str(size) + ']'
+	return name + '[n=' + str(size) + ',seed=' + str(seed) + ']'
+
+
+def time_case(function, repeat):
+	"""
+	Times a zero argument function. The number of calls per measurement is picked by timeit so that a
+	measurement takes at least 0.2 seconds, and the median of the repeated measurements is kept.
+	:return: seconds per call
+	"""
+	timer = timeit.Timer(function)
+	number, _ = timer.autorange()
+	return statistics.median(timer.repeat(repeat, number)) / number
+
+
+def run_benchmarks(names=None, repeat=REPEAT):
+	"""
+	Runs the benchmarks for every size and every seed of the benchmark.
+	:param names: Benchmarks to run, defaults to all of BENCHMARKS.
+	:param repeat: Number of measurements per case, the median is kept.
+	:return: dict from case key to seconds per call
+	"""
+	results = {}
+	for name in names or BENCHMARKS:
+		factory, sizes, seeds = BENCHMARKS[name]
+		for size in sizes:
+			for seed in seeds:
+				results[case_key(name, size, seed)] = time_case(factory(size, seed), repeat)
+	return results
+
+
+def save_baseline(results, path=BASELINE_PATH):
+	baseline = {
+		'python': platform.python_version(),
+		'machine': platform.machine(),
+		'results': results,
+	}
+	with open(path, 'w') as file:
+		json.dump(baseline, file, indent=1, sort_keys=True)
+
+
+def load_baseline(path=BASELINE_PATH):
+	with open(path) as file:
+		return json.load(file)['results']
+
+
+def compare(results, baseline, threshold):
+	"""
+	Compares a run against a baseline.
+	:param results: dict from case key to seconds, as returned by run_benchmarks()
+	:param baseline: dict from case key to seconds of an earlier run
+	:param threshold: relative slowdown that counts as a regression, 0.6 is 60% slower
+	:return: list of (key, baseline seconds, seconds, ratio, regressed) for every case of the run, with
+		None as the baseline seconds and ratio of a case missing from the baseline
+	"""
+	rows = []
+	for key, seconds in results.items():
+		if key not in baseline:
+			rows.append((key, None, seconds, None, False))
+			continue
+		ratio = seconds / baseline[key]
+		rows.append((key, baseline[key], seconds, ratio, ratio > 1 + threshold))
+	return rows
+
+
+def print_comparison(rows):
+	print('%-48s %12s %12s %8s' % ('case', 'baseline', 'current', 'change'))
+	for key, baseline_seconds, seconds, ratio, regressed in rows:
+		if baseline_seconds is None:
+			print('%-48s %12s %11.6fs  no baseline' % (key, '-', seconds))
+			continue
+		print('%-48s %11.6fs %11.6fs %+7.1f%%%s' % (key, baseline_seconds, seconds, 100 * (ratio - 1),
+			'  REGRESSION' if regressed else ''))
+
+
+def main():
+	"""
+	Runs the benchmark suite. The first run, or any run with --save, stores the timings as the baseline;
+	later runs compare against it and exit with status 1 if a case got slower than the threshold allows.
+	"""
+	parser = argparse.ArgumentParser(description='Benchmark the N-Queens solvers and the nim searches.')
+	parser.add_argument('benchmarks', nargs='*', metavar='BENCHMARK',
+						help='benchmarks to run, default all of: ' + ', '.join(BENCHMARKS))
+	parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON file')
+	parser.add_argument('--save', action='store_true', help='store this run as the new baseline')
+	parser.add_argument('--threshold', type=float, default=THRESHOLD, help='relative slowdown flagged as a regression')
+	parser.add_argument('--repeat', type=int, default=REPEAT, help='measurements per case, the median is kept')
+	args = parser.parse_args()
+	for name in args.benchmarks:
+		if name not in BENCHMARKS:
+			parser.error('unknown benchmark ' + name)
+
+	results = run_benchmarks(args.benchmarks, args.repeat)
+
+	if args.save or not os.path.exists(args.baseline):
+		save_baseline(results, args.baseline)
+		for key, seconds in results.items():
+			print('%-48s %11.6fs' % (key, seconds))
+		print('Baseline saved to ' + args.baseline)
+		return True
+
+	rows = compare(results, load_baseline(args.baseline), args.threshold)
+	print_comparison(rows)
+	missing = [row for row in rows if row[1] is None]
+	if missing:
+		print(str(len(missing)) + ' case(s) without a baseline, run with --save to record them')
+	regressions = [row for row in rows if row[4]]
+	if regressions:
+		print(str(len(regressions)) + ' regression(s) beyond ' + str(round(100 * args.threshold)) + '%')
+		sys.exit(1)
+	print('No regressions beyond ' + str(round(100 * args.threshold)) + '%')
+	return True
+
+
+if __name__ == '__main__':
+	main()
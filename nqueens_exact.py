@@ -0,0 +1,215 @@
+import os
+import timeit
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Boards smaller than this are counted in the calling process, a pool costs more than the search
+PARALLEL_MIN_QUEENS = 10
+
+
+def count_completions(nqueens_count, rows, diagonals, anti_diagonals, remaining):
+	"""
+	Counts the ways to complete a partial board with a depth-first search on bitmasks. Queens are placed
+	column by column; bit r of rows is set if row r is taken, and bit r of diagonals and anti_diagonals is
+	set if row r of the next column is attacked along a diagonal. Free rows are visited by repeatedly
+	taking the lowest set bit of the free mask, and the last column just counts its free rows.
+	:param nqueens_count: number of queens on the board
+	:param rows: bitmask of the rows taken so far
+	:param diagonals: bitmask of the rows of the next column attacked from below
+	:param anti_diagonals: bitmask of the rows of the next column attacked from above
+	:param remaining: number of columns left to fill, at least 1
+	:return: number of solutions extending the partial board
+	"""
+	full = (1 << nqueens_count) - 1
+
+	def solve(rows, diagonals, anti_diagonals, remaining):
+		available = full & ~(rows | diagonals | anti_diagonals)
+		if remaining == 1:
+			return bin(available).count('1')
+		count = 0
+		while available:
+			bit = available & -available
+			available ^= bit
+			count += solve(rows | bit, ((diagonals | bit) << 1) & full, (anti_diagonals | bit) >> 1, remaining - 1)
+		return count
+
+	return solve(rows, diagonals, anti_diagonals, remaining)
+
+
+def split_tasks(nqueens_count):
+	"""
+	Splits the search on the placements of the first two columns. Mirroring the board top to bottom maps
+	solutions with the first queen in row r to those with it in row n - 1 - r, so only the first queen in
+	the top half is searched and counted twice, plus the middle row once for odd n.
+	:param nqueens_count: number of queens on the board, at least 2
+	:return: list of (weight, rows, diagonals, anti_diagonals) after two queens
+	"""
+	full = (1 << nqueens_count) - 1
+	tasks = []
+	for first_row in range((nqueens_count + 1) // 2):
+		weight = 2 if first_row < nqueens_count // 2 else 1
+		bit = 1 << first_row
+		rows, diagonals, anti_diagonals = bit, (bit << 1) & full, bit >> 1
+		available = full & ~(rows | diagonals | anti_diagonals)
+		while available:
+			second = available & -available
+			available ^= second
+			tasks.append((weight, rows | second, ((diagonals | second) << 1) & full, (anti_diagonals | second) >> 1))
+	return tasks
+
+
+def count_task(nqueens_count, task):
+	weight, rows, diagonals, anti_diagonals = task
+	return weight * count_completions(nqueens_count, rows, diagonals, anti_diagonals, nqueens_count - 2)
+
+
+def count_solutions(nqueens_count, workers=None):
+	"""
+	Counts all solutions of the N-Queens problem exactly, for n up to about 17 in reasonable time. The
+	subtrees below the first two queens are counted in a process pool.
+	:param nqueens_count: number of queens on the board
+	:param workers: number of worker processes, defaults to the number of cores; 1 counts in this process
+	:return: number of solutions
+	"""
+	if nqueens_count < 2:
+		return nqueens_count  # one way to place a single queen, none to place no queens
+	tasks = split_tasks(nqueens_count)
+	if workers == 1 or nqueens_count < PARALLEL_MIN_QUEENS:
+		return sum(count_task(nqueens_count, task) for task in tasks)
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		return sum(executor.map(count_task, [nqueens_count] * len(tasks), tasks))
+
+
+def solutions(nqueens_count, first_rows=None):
+	"""
+	Generates every solution of the N-Queens problem lazily, in lexicographic order. Uses the same bitmask
+	search as count_completions(), unrolled into an explicit stack so a solution can be yielded as soon as
+	it is found.
+	:param nqueens_count: number of queens on the board
+	:param first_rows: rows the queen of the first column may take, defaults to all
+	:return: generator of lists where board[column] is the row of the queen on that column
+	"""
+	if nqueens_count < 1:
+		return
+	full = (1 << nqueens_count) - 1
+	last = nqueens_count - 1
+	board = [0] * nqueens_count
+	# masks of the rows that are taken or attacked in every column, and the rows still to try there
+	rows = [0] * nqueens_count
+	diagonals = [0] * nqueens_count
+	anti_diagonals = [0] * nqueens_count
+	available = [0] * nqueens_count
+	available[0] = full if first_rows is None else sum(1 << row for row in set(first_rows)) & full
+	column = 0
+
+	while column >= 0:
+		free = available[column]
+		if not free:
+			column -= 1
+			continue
+		bit = free & -free
+		available[column] = free ^ bit
+		board[column] = bit.bit_length() - 1
+		if column == last:
+			yield list(board)
+			continue
+		taken = rows[column] | bit
+		diagonal = ((diagonals[column] | bit) << 1) & full
+		anti_diagonal = (anti_diagonals[column] | bit) >> 1
+		column += 1
+		rows[column] = taken
+		diagonals[column] = diagonal
+		anti_diagonals[column] = anti_diagonal
+		available[column] = full & ~(taken | diagonal | anti_diagonal)
+
+
+def symmetries(board):
+	"""
+	The 8 images of a solution under the symmetries of the square: the board itself, mirrored left to
+	right, mirrored top to bottom and rotated by 180 degrees, plus the transposes of those four, which are
+	the rotations by 90 and 270 degrees and the reflections in the two diagonals.
+	:param board: list/array representation of columns and the row of the queen on that column
+	:return: list of 8 tuples in the same representation
+	"""
+	last = len(board) - 1
+	mirrored = tuple(reversed(board))
+	images = [tuple(board), mirrored, tuple(last - row for row in board), tuple(last - row for row in mirrored)]
+	for image in images[:4]:
+		transposed = [0] * len(board)
+		for column, row in enumerate(image):
+			transposed[row] = column
+		images.append(tuple(transposed))
+	return images
+
+
+def canonical_form(board):
+	"""
+	:param board: list/array representation of columns and the row of the queen on that column
+	:return: tuple of the lexicographically smallest image of the board under symmetries() and the
+		number of distinct images, which is 1, 2, 4 or 8
+	"""
+	images = symmetries(board)
+	return min(images), len(set(images))
+
+
+def unique_solutions(nqueens_count):
+	"""
+	Generates one solution of every symmetry class of the N-Queens problem, the lexicographically smallest
+	of its 8 images, in lexicographic order. Mirroring top to bottom maps a first queen in row r to row
+	n - 1 - r, so the smallest image always has its first queen in the top half and the search only starts
+	from there. Summing the class sizes gives the total number of solutions, e.g. 12 unique solutions
+	with sizes adding up to 92 for 8 queens.
+	:param nqueens_count: number of queens on the board
+	:return: generator of tuples of a board, as a list where board[column] is the row of the queen on that
+		column, and the size of its symmetry class
+	"""
+	for board in solutions(nqueens_count, range((nqueens_count + 1) // 2)):
+		canonical, size = canonical_form(board)
+		if canonical == tuple(board):
+			yield board, size
+
+
+def main():
+	"""
+	Counts the solutions for a board size, or prints them:
+	python nqueens_exact.py NUMBER [--workers W] [--list [LIMIT]] [--unique]
+	"""
+	parser = argparse.ArgumentParser(description='Count or list all solutions of the N-Queens problem.')
+	parser.add_argument('n_queens', type=int, metavar='NUMBER', help='number of queens')
+	parser.add_argument('--workers', type=int, default=None, help='worker processes, default the number of cores')
+	parser.add_argument('--list', type=int, nargs='?', const=0, default=None, metavar='LIMIT',
+						help='print the solutions instead of counting them, at most LIMIT if given')
+	parser.add_argument('--unique', action='store_true',
+						help='only one solution per class of rotations and reflections, with the class size')
+	args = parser.parse_args()
+	if args.n_queens < 1:
+		parser.error('NUMBER must be at least 1')
+
+	if args.unique:
+		unique = 0
+		total = 0
+		for board, size in unique_solutions(args.n_queens):
+			if args.list is not None and (not args.list or unique < args.list):
+				print(' '.join(map(str, board)) + '  (' + str(size) + ' images)')
+			unique += 1
+			total += size
+		print(str(unique) + ' unique solutions for ' + str(args.n_queens) + ' queens, ' + str(total) + ' in total')
+		return True
+
+	if args.list is not None:
+		for index, board in enumerate(solutions(args.n_queens)):
+			if args.list and index == args.list:
+				break
+			print(' '.join(map(str, board)))
+		return True
+
+	start_time = timeit.default_timer()
+	count = count_solutions(args.n_queens, args.workers)
+	elapsed = timeit.default_timer() - start_time
+	print(str(count) + ' solutions for ' + str(args.n_queens) + ' queens (' + str(round(elapsed, 3)) + ' seconds, '
+		  + str(args.workers or os.cpu_count()) + ' workers)')
+	return True
+
+
+if __name__ == '__main__':
+	main()
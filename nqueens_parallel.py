@@ -0,0 +1,540 @@
+import os
+import sys
+import math
+import heapq
+import random
+import timeit
+import contextlib
+from array import array
+import multiprocessing
+from queue import Empty
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import nqueens
+from nqueens import np
+
+# Algorithms that can be raced in a portfolio, see portfolio()
+PORTFOLIO_ALGORITHMS = ('hill_climbing_improved', 'simulated_annealing', 'genetic_algorithm')
+RESULT_POLL_INTERVAL = 1  # seconds island_model() waits for a result before checking its islands
+# Named solver settings that can be benchmarked next to the plain solvers, see trial()
+# simulated_annealing_slow is the annealing nqueens_success_rate.py measured before it used nqueens.SOLVERS
+TRIAL_VARIANTS = {
+	'simulated_annealing_slow': ('simulated_annealing', {'schedule': 'slow', 'kmax': 10000}),
+}
+
+
+def run_silently(algorithm, board, **options):
+	"""
+	Runs a solver from nqueens.SOLVERS without printing its progress and boards.
+	:param algorithm: Name of the solver in nqueens.SOLVERS.
+	:param board: The board to start from.
+	:return: SearchResult of the run.
+	"""
+	with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+		return nqueens.SOLVERS[algorithm](board, **options)
+
+
+def restart(algorithm, nqueens_count, seed):
+	"""
+	A single independent restart: a fresh random board with its own seed.
+	:param algorithm: Name of the solver in nqueens.SOLVERS.
+	:param nqueens_count: Number of queens on the board.
+	:param seed: Seed for the random number generator of this restart.
+	:return: tuple of the seed and the SearchResult of the run.
+	"""
+	random.seed(seed)
+	board = nqueens.init_board(nqueens_count)
+	return seed, run_silently(algorithm, board)
+
+
+def terminate_workers(executor):
+	"""
+	Stops the worker processes of an executor, including the ones that are still running a task.
+	"""
+	terminate = getattr(executor, 'terminate_workers', None)  # Python 3.14+
+	if terminate is not None:
+		terminate()
+		return
+	for process in list((executor._processes or {}).values()):
+		process.terminate()
+
+
+def portfolio(algorithm, nqueens_count, restarts, workers=None, seed=0):
+	"""
+	Races independent random restarts of a solver in a process pool. Restart k uses seed + k, so a
+	portfolio run is reproducible per restart. As soon as one restart finds a solution the workers are
+	stopped, which cancels both the running and the pending restarts.
+	:param algorithm: One of PORTFOLIO_ALGORITHMS.
+	:param nqueens_count: Number of queens on the board.
+	:param restarts: Number of independent restarts.
+	:param workers: Number of worker processes, defaults to the number of cores.
+	:param seed: Seed of the first restart.
+	:return: tuple of the seed and SearchResult of the first solution, or of the best restart if none solved it.
+	"""
+	if algorithm not in PORTFOLIO_ALGORITHMS:
+		raise ValueError('Unknown portfolio algorithm: ' + str(algorithm))
+
+	executor = ProcessPoolExecutor(max_workers=workers)
+	futures = [executor.submit(restart, algorithm, nqueens_count, seed + k) for k in range(restarts)]
+	best = None
+	try:
+		for future in as_completed(futures):
+			result_seed, result = future.result()
+			if best is None or result.conflicts < best[1].conflicts:
+				best = (result_seed, result)
+			if result.conflicts == 0:
+				break
+	finally:
+		# Stops the restarts that are still queued or running. Pending futures are not cancelled one by
+		# one, the executor fails them itself once it notices its workers are gone.
+		terminate_workers(executor)
+		executor.shutdown(wait=True)
+	return best
+
+
+def trial(algorithm, nqueens_count, seed):
+	"""
+	A single benchmark trial on a fresh random board.
+	:param algorithm: Name of the solver in nqueens.SOLVERS or of a variant in TRIAL_VARIANTS.
+	:param nqueens_count: Number of queens on the board.
+	:param seed: Seed for the random number generator of this trial.
+	:return: tuple of whether the board was solved, the wall time in seconds and the number of evaluations.
+	"""
+	algorithm, options = TRIAL_VARIANTS.get(algorithm, (algorithm, {}))
+	random.seed(seed)
+	board = nqueens.init_board(nqueens_count)
+	start_time = timeit.default_timer()
+	result = run_silently(algorithm, board, **options)
+	return result.conflicts == 0, timeit.default_timer() - start_time, result.evaluations
+
+
+def percentile(values, fraction):
+	"""
+	Nearest-rank percentile.
+	:param values: Sorted list of values.
+	:param fraction: Percentile as a fraction, 0.95 for p95.
+	:return: The value at the percentile, or None for an empty list.
+	"""
+	if not values:
+		return None
+	return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def run_trials(algorithms, sizes, trials, seed=0, workers=None):
+	"""
+	Runs every combination of algorithm and board size for the given number of trials, spreading the
+	trials over a process pool. Trial t of a configuration uses seed + t, so every algorithm sees the
+	same boards for a given size.
+	:param algorithms: Names of solvers in nqueens.SOLVERS or of variants in TRIAL_VARIANTS.
+	:param sizes: Board sizes to run.
+	:param trials: Number of trials per configuration.
+	:param seed: Seed of the first trial.
+	:param workers: Number of worker processes, defaults to the number of cores.
+	:return: list with a dict of statistics per configuration.
+	"""
+	configurations = [(algorithm, size) for algorithm in algorithms for size in sizes]
+	for algorithm in algorithms:
+		if algorithm not in nqueens.SOLVERS and algorithm not in TRIAL_VARIANTS:
+			raise ValueError('Unknown algorithm: ' + str(algorithm))
+
+	jobs = [(algorithm, size, seed + t) for algorithm, size in configurations for t in range(trials)]
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		# Trials are short, so hand them out in chunks to keep the pickling overhead down
+		chunksize = max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))
+		outcomes = list(executor.map(trial, *zip(*jobs), chunksize=chunksize))
+
+	report = []
+	for index, (algorithm, size) in enumerate(configurations):
+		results = outcomes[index * trials:(index + 1) * trials]
+		solved_times = sorted(elapsed for solved, elapsed, evaluations in results if solved)
+		report.append({
+			'algorithm': algorithm,
+			'n': size,
+			'trials': trials,
+			'success_rate': len(solved_times) / trials,
+			'mean_time': sum(solved_times) / len(solved_times) if solved_times else None,
+			'p95_time': percentile(solved_times, 0.95),
+			'mean_evaluations': sum(evaluations for solved, elapsed, evaluations in results) / trials,
+		})
+	return report
+
+
+def print_trial_report(report):
+	"""
+	Prints the statistics of run_trials() as a table. Times are for the solved trials only.
+	"""
+	print('%-30s %6s %7s %8s %11s %11s %14s' % ('algorithm', 'n', 'trials', 'success', 'mean time', 'p95 time', 'evaluations'))
+	for row in report:
+		mean_time = '-' if row['mean_time'] is None else '%.4fs' % row['mean_time']
+		p95_time = '-' if row['p95_time'] is None else '%.4fs' % row['p95_time']
+		print('%-30s %6d %7d %7.1f%% %11s %11s %14.1f' % (row['algorithm'], row['n'], row['trials'],
+			100 * row['success_rate'], mean_time, p95_time, row['mean_evaluations']))
+
+
+def island(index, nqueens_count, population_size, migration_interval, migrants, maxtime, seed, options,
+		   inbox, outbox, stop, results):
+	"""
+	One island of island_model(), run in its own process. Evolves a list population with nqueens.breed()
+	and every migration_interval generations sends copies of its best individuals to the next island and
+	replaces its worst individuals with whatever migrants have arrived.
+	:param index: Number of the island.
+	:param options: dict with the elitism_num and selection options of nqueens.breed().
+	:param inbox: Queue with migrants from the previous island.
+	:param outbox: Queue to the next island.
+	:param stop: Event set by the first island that finds a solution, or by the parent process.
+	:param results: Queue that receives (index, SearchResult) when the island stops.
+	"""
+	# Migrants still in transit when an island stops are not needed, so exiting must not wait for them
+	inbox.cancel_join_thread()
+	outbox.cancel_join_thread()
+	random.seed(seed)
+	start_time = timeit.default_timer()
+	max_fitness = math.comb(nqueens_count, 2)
+	population = [nqueens.init_board(nqueens_count) for individual in range(population_size)]
+	fitness = [nqueens.findFitness(individual, nqueens_count) for individual in population]
+	evaluations = population_size
+	generations = 0
+
+	while max(fitness) != max_fitness and not stop.is_set():
+		if timeit.default_timer() - start_time > maxtime:
+			break
+		generations += 1
+		population = nqueens.breed(population, fitness, options['elitism_num'], options['selection'])
+		fitness = [nqueens.findFitness(individual, nqueens_count) for individual in population]
+		evaluations += population_size
+
+		if generations % migration_interval == 0:
+			outbox.put([population[i] for i in nqueens.select_elite(fitness, migrants)])
+			arrivals = []
+			try:
+				while True:
+					arrivals.extend(inbox.get_nowait())
+			except Empty:
+				pass
+			worst = heapq.nsmallest(len(arrivals), range(population_size), key=fitness.__getitem__)
+			for position, migrant in zip(worst, arrivals):
+				population[position] = migrant
+				fitness[position] = nqueens.findFitness(migrant, nqueens_count)
+			evaluations += len(arrivals)
+
+	best = max(range(population_size), key=fitness.__getitem__)
+	if fitness[best] == max_fitness:
+		stop.set()
+	results.put((index, nqueens.SearchResult(list(population[best]), max_fitness - fitness[best],
+											 generations, evaluations)))
+
+
+def island_model(nqueens_count, islands=None, population_size=None, migration_interval=10, migrants=2,
+				 maxtime=10, seed=0, elitism_num=10, selection='roulette'):
+	"""
+	Island-model genetic algorithm. Every island evolves its own population in a separate process and the
+	islands form a ring: every migration_interval generations each island sends copies of its best
+	migrants individuals to the next one over a queue. All islands stop as soon as one finds a solution.
+	:param nqueens_count: Number of queens on the board.
+	:param islands: Number of islands, defaults to the number of cores.
+	:param population_size: Population per island, defaults to the population of genetic_algorithm()
+		(100 * n) divided over the islands.
+	:param migration_interval: Number of generations between migrations.
+	:param migrants: Number of individuals sent per migration.
+	:param maxtime: Number of seconds after which every island gives up.
+	:param seed: Seed of the first island, island k uses seed + k.
+	:param elitism_num: Number of best individuals transferred unchanged per island.
+	:param selection: Name of the parent selection method in nqueens.SELECTION_METHODS.
+	:return: SearchResult with the solution, or the best individual over all islands; its iterations are
+		the most generations of any island and its evaluations the total over all islands.
+	"""
+	if selection not in nqueens.SELECTION_METHODS:
+		raise ValueError('Unknown selection method ' + repr(selection) + ', expected one of '
+						 + ', '.join(nqueens.SELECTION_METHODS))
+	islands = islands or os.cpu_count() or 1
+	if population_size is None:
+		population_size = max(2 * elitism_num, 100 * nqueens_count // islands)
+	options = {'elitism_num': elitism_num, 'selection': selection}
+
+	queues = [multiprocessing.Queue() for queue in range(islands)]
+	stop = multiprocessing.Event()
+	results = multiprocessing.Queue()
+	processes = [multiprocessing.Process(target=island, args=(
+		index, nqueens_count, population_size, migration_interval, migrants, maxtime, seed + index, options,
+		queues[index], queues[(index + 1) % islands], stop, results)) for index in range(islands)]
+	for process in processes:
+		process.start()
+
+	island_results = []
+	try:
+		# Results must be read before joining, a process does not exit while its queue data is unread. An
+		# island that dies never sends one, so the processes are checked whenever no result arrives in time.
+		while len(island_results) < islands:
+			try:
+				island_results.append(results.get(timeout=RESULT_POLL_INTERVAL)[1])
+			except Empty:
+				failed = [process for process in processes if process.exitcode not in (None, 0)]
+				if failed:
+					raise RuntimeError('Island process exited with code ' + str(failed[0].exitcode)
+									   + ' without a result')
+				if all(process.exitcode is not None for process in processes):
+					try:
+						island_results.append(results.get(timeout=RESULT_POLL_INTERVAL)[1])
+					except Empty:
+						raise RuntimeError('Island processes exited without a result')
+				continue
+			if island_results[-1].conflicts == 0:
+				stop.set()
+	finally:
+		stop.set()
+		for process in processes:
+			process.join()
+
+	best = min(island_results, key=lambda result: result.conflicts)
+	return nqueens.SearchResult(best.board, best.conflicts, max(result.iterations for result in island_results),
+								sum(result.evaluations for result in island_results))
+
+
+def attach_shared_memory(name):
+	"""
+	Attaches to an existing shared memory block without taking ownership of it, the process that created
+	the block unlinks it.
+	"""
+	try:
+		return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+	except TypeError:
+		# Pool workers share the resource tracker of the parent, which already tracks the block
+		return shared_memory.SharedMemory(name=name)
+
+
+class SharedPopulation:
+	"""
+	Population of boards in a multiprocessing.shared_memory int16 buffer, one board per row, with a shared
+	int64 fitness array next to it. Worker processes attach to both blocks by name, so evaluating a slice
+	of the population sends only two names and a few integers to a worker and no board is ever copied.
+	Create it in the parent process, attach to it in workers with attach=True, and close() it everywhere
+	when done; the creator also unlinks the blocks.
+	"""
+
+	def __init__(self, size, nqueens_count, names=None):
+		"""
+		:param size: Number of individuals.
+		:param nqueens_count: Number of queens per board.
+		:param names: Names of the board and fitness blocks to attach to, new blocks are created when not given.
+		"""
+		self.size = size
+		self.nqueens = nqueens_count
+		board_bytes = max(1, 2 * size * nqueens_count)
+		fitness_bytes = max(1, 8 * size)
+		self.owner = names is None
+		if self.owner:
+			self.board_memory = shared_memory.SharedMemory(create=True, size=board_bytes)
+			self.fitness_memory = shared_memory.SharedMemory(create=True, size=fitness_bytes)
+		else:
+			self.board_memory = attach_shared_memory(names[0])
+			self.fitness_memory = attach_shared_memory(names[1])
+		# Blocks can be rounded up to whole pages, so only view the part that is used
+		self.boards = self.board_memory.buf[:2 * size * nqueens_count].cast('h')
+		self.fitness = self.fitness_memory.buf[:8 * size].cast('q')
+
+	@property
+	def names(self):
+		return self.board_memory.name, self.fitness_memory.name
+
+	def board(self, index):
+		"""
+		:return: memoryview of the board of an individual, usable wherever a board is read
+		"""
+		return self.boards[index * self.nqueens:(index + 1) * self.nqueens]
+
+	def set_board(self, index, board):
+		self.boards[index * self.nqueens:(index + 1) * self.nqueens] = array('h', board)
+
+	def arrays(self):
+		"""
+		:return: tuple of NumPy views of the boards (size x n) and the fitness values, without copying.
+		"""
+		boards = np.ndarray((self.size, self.nqueens), dtype=np.int16, buffer=self.boards)
+		fitness = np.ndarray((self.size,), dtype=np.int64, buffer=self.fitness)
+		return boards, fitness
+
+	def evaluate(self, start, stop):
+		"""
+		Computes findFitness() of the individuals start up to stop and stores it in the shared fitness array.
+		"""
+		if np is not None:
+			boards, fitness = self.arrays()
+			fitness[start:stop] = nqueens.population_fitness(boards[start:stop])
+			del boards, fitness
+			return
+		for index in range(start, stop):
+			board = self.board(index)
+			self.fitness[index] = nqueens.findFitness(board, self.nqueens)
+			board.release()
+
+	def close(self):
+		"""
+		Releases the views and closes the blocks; the creating process also unlinks them.
+		"""
+		self.boards.release()
+		self.fitness.release()
+		self.board_memory.close()
+		self.fitness_memory.close()
+		if self.owner:
+			self.board_memory.unlink()
+			self.fitness_memory.unlink()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+
+def evaluate_shared_slice(names, size, nqueens_count, start, stop):
+	"""
+	Worker side of parallel_fitness(): attaches to a SharedPopulation and evaluates one slice of it.
+	"""
+	with SharedPopulation(size, nqueens_count, names) as population:
+		population.evaluate(start, stop)
+	return stop - start
+
+
+def parallel_fitness(population, executor, chunks=None):
+	"""
+	Evaluates a SharedPopulation over a process pool. Every worker computes the fitness of a contiguous
+	slice in place, so the only data sent to the workers are the names of the shared blocks.
+	:param population: SharedPopulation created by this process.
+	:param executor: ProcessPoolExecutor to run the slices on.
+	:param chunks: Number of slices, defaults to the number of cores.
+	:return: memoryview of the shared fitness array.
+	"""
+	chunks = chunks or os.cpu_count() or 1
+	bounds = [population.size * chunk // chunks for chunk in range(chunks + 1)]
+	futures = [executor.submit(evaluate_shared_slice, population.names, population.size, population.nqueens,
+							   bounds[chunk], bounds[chunk + 1])
+			   for chunk in range(chunks) if bounds[chunk] < bounds[chunk + 1]]
+	for future in futures:
+		future.result()
+	return population.fitness
+
+
+class SharedFitnessEvaluator:
+	"""
+	Fitness evaluator for nqueens.genetic_algorithm(evaluator=...) that spreads every generation over a
+	process pool. Each generation is copied once into a SharedPopulation, the workers evaluate their
+	slices of it in place with parallel_fitness(), and the parent reads the shared fitness array back, so
+	no board is pickled. The shared blocks are reused while the population size stays the same.
+	Use it as a context manager, or close() it, to stop the workers and free the shared memory.
+	"""
+
+	def __init__(self, workers=None, chunks=None):
+		"""
+		:param workers: Number of worker processes, defaults to the number of cores.
+		:param chunks: Number of slices per generation, defaults to the number of workers.
+		"""
+		if np is None:
+			raise ImportError('The shared fitness evaluator requires NumPy')
+		self.workers = workers or os.cpu_count() or 1
+		self.chunks = chunks or self.workers
+		self.executor = ProcessPoolExecutor(max_workers=self.workers)
+		self.shared = None
+
+	def __call__(self, population):
+		"""
+		:param population: 2-D NumPy array with one board per row
+		:return: NumPy array with the findFitness() value of every individual
+		"""
+		size, nqueens_count = population.shape
+		if self.shared is None or (self.shared.size, self.shared.nqueens) != (size, nqueens_count):
+			if self.shared is not None:
+				self.shared.close()
+			self.shared = SharedPopulation(size, nqueens_count)
+		boards, fitness = self.shared.arrays()
+		boards[:] = population
+		parallel_fitness(self.shared, self.executor, self.chunks)
+		result = fitness.copy()
+		del boards, fitness
+		return result
+
+	def close(self):
+		self.executor.shutdown()
+		if self.shared is not None:
+			self.shared.close()
+			self.shared = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+
+def shared_genetic_algorithm(nqueens_count, workers=None, seed=0, **options):
+	"""
+	Runs nqueens.genetic_algorithm() with its fitness evaluated by a SharedFitnessEvaluator.
+	:param nqueens_count: Number of queens on the board.
+	:param workers: Number of worker processes, defaults to the number of cores.
+	:param seed: Seed of the run.
+	:param options: Further keyword arguments of nqueens.genetic_algorithm().
+	:return: SearchResult of the run.
+	"""
+	random.seed(seed)
+	board = nqueens.init_board(nqueens_count)
+	with SharedFitnessEvaluator(workers) as evaluator:
+		return run_silently('genetic_algorithm', board, vectorized=True, evaluator=evaluator, **options)
+
+
+def main():
+	"""
+	Runs a portfolio, the island-model genetic algorithm with one island per restart, or the genetic
+	algorithm with its fitness evaluated in shared memory by WORKERS processes, from the command line:
+	python nqueens_parallel.py ALGORITHM NUMBER RESTARTS [WORKERS]
+	python nqueens_parallel.py island_model NUMBER ISLANDS
+	python nqueens_parallel.py shared_genetic_algorithm NUMBER WORKERS
+	"""
+	try:
+		if len(sys.argv) not in (4, 5):
+			raise ValueError
+		algorithm = sys.argv[1]
+		if algorithm not in PORTFOLIO_ALGORITHMS + ('island_model', 'shared_genetic_algorithm'):
+			raise ValueError
+		n_queens = int(sys.argv[2])
+		restarts = int(sys.argv[3])
+		workers = int(sys.argv[4]) if len(sys.argv) == 5 else None
+		if n_queens < 1 or n_queens > nqueens.MAXQ or restarts < 1:
+			raise ValueError
+
+	except ValueError:
+		print('Usage: python nqueens_parallel.py {' + ','.join(PORTFOLIO_ALGORITHMS) + '} NUMBER RESTARTS [WORKERS]')
+		print('       python nqueens_parallel.py island_model NUMBER ISLANDS')
+		print('       python nqueens_parallel.py shared_genetic_algorithm NUMBER WORKERS')
+		return False
+
+	if algorithm == 'shared_genetic_algorithm':
+		result = shared_genetic_algorithm(n_queens, restarts)
+		if result.conflicts == 0:
+			print('Solved puzzle! (' + str(result.iterations) + ' generations)')
+		else:
+			print('No Solution Found! Best individual has ' + str(result.conflicts) + ' conflicts')
+		print('Final state is:')
+		nqueens.print_board(result.board)
+		return True
+
+	if algorithm == 'island_model':
+		result = island_model(n_queens, restarts)
+		if result.conflicts == 0:
+			print('Solved puzzle! (' + str(result.iterations) + ' generations)')
+		else:
+			print('No Solution Found! Best island has ' + str(result.conflicts) + ' conflicts')
+		print('Final state is:')
+		nqueens.print_board(result.board)
+		return True
+
+	seed, result = portfolio(algorithm, n_queens, restarts, workers)
+	if result.conflicts == 0:
+		print('Solved puzzle! (restart with seed ' + str(seed) + ')')
+	else:
+		print('No Solution Found! Best restart (seed ' + str(seed) + ') has ' + str(result.conflicts) + ' conflicts')
+	print('Final state is:')
+	nqueens.print_board(result.board)
+
+
+if __name__ == '__main__':
+	main()
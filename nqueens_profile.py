@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+import functools
+import contextlib
+
+import nqueens
+
+# Functions wrapped by default: the ones named in the assignment plus the hot paths the solvers call today.
+# Names with a dot are methods of a class in nqueens.
+PROFILED_FUNCTIONS = (
+	'count_conflicts',
+	'in_conflict',
+	'evaluate_state',
+	'random_move',
+	'random_move_batch',
+	'random_successor',
+	'BoardState.propose',
+	'BoardState.delta',
+	'BoardState.move',
+	'findFitness',
+	'population_fitness',
+	'randomSelection',
+	'roulette_selection',
+	'stochastic_universal_sampling',
+	'tournament_selection',
+	'select_elite',
+	'crossover',
+	'crossover_population',
+	'mutate',
+)
+
+# Module level tables of nqueens that hold functions, their entries are swapped along with the globals
+REGISTRIES = ('SELECTION_METHODS', 'COOLING_SCHEDULES', 'SOLVERS')
+
+
+class Profiler:
+	"""
+	Opt-in call counters and cumulative timers for the functions of nqueens. While enabled, every profiled
+	function is replaced by a wrapper, both as a module global (or class attribute) and in the registries
+	that refer to it, so the solvers pick the wrappers up without any change to their code. Disabling
+	puts the original functions back, so nqueens runs at full speed whenever no profiler is active.
+	Times are cumulative: a function that calls another profiled function includes its time, e.g.
+	count_conflicts includes in_conflict.
+	"""
+
+	def __init__(self, names=PROFILED_FUNCTIONS, module=nqueens):
+		"""
+		:param names: names of the functions to profile, Class.method for methods
+		:param module: module the functions live in
+		"""
+		self.names = tuple(names)
+		self.module = module
+		self.calls = dict.fromkeys(self.names, 0)
+		self.seconds = dict.fromkeys(self.names, 0.0)
+		self.originals = {}
+		self.elapsed = 0.0
+		self.start_time = None
+
+	def owner(self, name):
+		"""
+		:return: tuple of the object holding the function and its attribute name
+		"""
+		if '.' in name:
+			class_name, attribute = name.split('.', 1)
+			return getattr(self.module, class_name), attribute
+		return self.module, name
+
+	def wrap(self, name, function):
+		calls, seconds = self.calls, self.seconds
+		timer = timeit.default_timer
+
+		@functools.wraps(function)
+		def wrapper(*args, **kwargs):
+			start = timer()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				seconds[name] += timer() - start
+				calls[name] += 1
+		return wrapper
+
+	def enable(self):
+		if self.originals:
+			return
+		replacements = {}
+		for name in self.names:
+			owner, attribute = self.owner(name)
+			function = getattr(owner, attribute)
+			wrapper = self.wrap(name, function)
+			self.originals[name] = function
+			replacements[function] = wrapper
+			setattr(owner, attribute, wrapper)
+		for registry in REGISTRIES:
+			table = getattr(self.module, registry, {})
+			for key, function in table.items():
+				if function in replacements:
+					table[key] = replacements[function]
+		self.start_time = timeit.default_timer()
+
+	def disable(self):
+		if not self.originals:
+			return
+		self.elapsed += timeit.default_timer() - self.start_time
+		wrappers = {}
+		for name, function in self.originals.items():
+			owner, attribute = self.owner(name)
+			wrappers[getattr(owner, attribute)] = function
+			setattr(owner, attribute, function)
+		for registry in REGISTRIES:
+			table = getattr(self.module, registry, {})
+			for key, function in table.items():
+				if function in wrappers:
+					table[key] = wrappers[function]
+		self.originals = {}
+
+	def __enter__(self):
+		self.enable()
+		return self
+
+	def __exit__(self, *exc_info):
+		self.disable()
+		return False
+
+	def report(self):
+		"""
+		:return: dict with the profiled wall time and, per called function, its calls, cumulative seconds,
+			share of the wall time and microseconds per call
+		"""
+		functions = {}
+		for name in self.names:
+			calls = self.calls[name]
+			if calls == 0:
+				continue
+			seconds = self.seconds[name]
+			functions[name] = {
+				'calls': calls,
+				'seconds': seconds,
+				'share': seconds / self.elapsed if self.elapsed > 0 else 0.0,
+				'us_per_call': 1e6 * seconds / calls,
+			}
+		return {'elapsed': self.elapsed, 'functions': functions}
+
+
+def print_report(report):
+	print('%-32s %10s %12s %7s %12s' % ('function', 'calls', 'cumulative', 'share', 'per call'))
+	rows = sorted(report['functions'].items(), key=lambda item: item[1]['seconds'], reverse=True)
+	for name, row in rows:
+		print('%-32s %10d %11.4fs %6.1f%% %10.2fus' % (name, row['calls'], row['seconds'], 100 * row['share'],
+												   row['us_per_call']))
+	print('%-32s %10s %11.4fs' % ('total run time', '', report['elapsed']))
+
+
+def profile_solver(algorithm, nqueens_count, seed=0, names=PROFILED_FUNCTIONS, **options):
+	"""
+	Runs one solver from nqueens.SOLVERS under a Profiler, with its output discarded.
+	:param algorithm: name of the solver
+	:param nqueens_count: number of queens
+	:param seed: seed of the random board and the run
+	:param names: functions to profile
+	:return: tuple of the SearchResult and the profiler report
+	"""
+	random.seed(seed)
+	board = nqueens.init_board(nqueens_count)
+	profiler = Profiler(names)
+	with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), profiler:
+		result = nqueens.SOLVERS[algorithm](board, **options)
+	return result, profiler.report()
+
+
+def main():
+	"""
+	Profiles one run of a solver: python nqueens_profile.py ALGORITHM NUMBER [--seed S] [--json]
+	"""
+	parser = argparse.ArgumentParser(description='Count the calls and time spent in the N-Queens hot functions.')
+	parser.add_argument('algorithm', choices=list(nqueens.SOLVERS), help='solver to profile')
+	parser.add_argument('n_queens', type=int, metavar='NUMBER', help='number of queens')
+	parser.add_argument('--seed', type=int, default=0, help='seed of the board and the run')
+	parser.add_argument('--maxtime', type=float, default=None, help='time limit of the genetic algorithm')
+	parser.add_argument('--json', action='store_true', help='print the breakdown as JSON')
+	args = parser.parse_args()
+	if args.n_queens < 1 or args.n_queens > nqueens.MAXQ:
+		parser.error('NUMBER must be between 1 and ' + str(nqueens.MAXQ))
+
+	options = {'maxtime': args.maxtime} if args.maxtime is not None and args.algorithm == 'genetic_algorithm' else {}
+	result, report = profile_solver(args.algorithm, args.n_queens, args.seed, **options)
+	report['algorithm'] = args.algorithm
+	report['n'] = args.n_queens
+	report['conflicts'] = result.conflicts
+	report['iterations'] = result.iterations
+	if args.json:
+		json.dump(report, sys.stdout, indent=1)
+		print()
+		return True
+	print(args.algorithm + ' n=' + str(args.n_queens) + ': ' + str(result.conflicts) + ' conflicts after '
+		  + str(result.iterations) + ' iterations')
+	print_report(report)
+	return True
+
+
+if __name__ == '__main__':
+	main()